@@ -1,25 +1,61 @@
-from flask import Flask, jsonify, request, render_template
-from metrics_collector import PokemonMetricsCollector
-from pokemon_data import is_valid_pokemon
-from config import API_KEYS
+from flask import Flask, Response, jsonify, request, render_template, stream_with_context
+from metrics_collector import PokemonMetricsCollector, is_degraded
+from leaderboard import Leaderboard
+from instrumentation import render_prometheus
+from pokemon_data import MAX_SUGGESTIONS, VALID_POKEMON, canonicalize_pokemon, suggest_pokemon
+from config import API_KEYS, CACHE_CONFIG, CHART_CONFIG, CONCURRENCY_CONFIG, HTTP_CONFIG, LEADERBOARD_CONFIG, HISTORY_CONFIG, SERVER_CONFIG
+from datetime import datetime, timedelta
+import gzip
+import hashlib
+import json
 import logging
 from dotenv import load_dotenv
 import os
 
 app = Flask(__name__)
 metrics_collector = PokemonMetricsCollector()
+leaderboard = Leaderboard(metrics_collector, VALID_POKEMON)
+
+load_dotenv()  # Load environment variables from .env file
 
 # Set up logging
-logging.basicConfig(level=logging.DEBUG)
+SERVER_CONFIG['log_level'] = os.getenv('LOG_LEVEL', SERVER_CONFIG['log_level']).upper()
+logging.basicConfig(level=SERVER_CONFIG['log_level'])
 logger = logging.getLogger(__name__)
 
-load_dotenv()  # Load environment variables from .env file
-
 # Update config with environment variables
 API_KEYS['reddit']['client_id'] = os.getenv('REDDIT_CLIENT_ID')
 API_KEYS['reddit']['client_secret'] = os.getenv('REDDIT_CLIENT_SECRET')
 API_KEYS['youtube']['api_key'] = os.getenv('YOUTUBE_API_KEY')
 
+if HTTP_CONFIG['warm_up']:
+    metrics_collector.warm_up()
+
+background_lock = None
+
+def claim_background_tasks():
+    """Check whether this process runs the background jobs; with several server workers only one does"""
+    global background_lock
+    if SERVER_CONFIG['workers'] <= 1 or background_lock is not None:
+        return True
+    import fcntl  # Unix only; the single-worker dev server never gets here
+
+    os.makedirs(CACHE_CONFIG['cache_dir'], exist_ok=True)
+    lock = open(os.path.join(CACHE_CONFIG['cache_dir'], 'background.lock'), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    background_lock = lock  # Held until the process exits, when the OS releases it
+    return True
+
+@app.before_first_request
+def start_background_tasks():
+    # Started on first request so the debug reloader's parent stays idle
+    if LEADERBOARD_CONFIG['enabled'] and claim_background_tasks():
+        leaderboard.start()
+
 @app.route('/')
 def home():
     return render_template('index.html')  # Serve the HTML file from templates
@@ -32,17 +68,191 @@ def get_metrics():
     
     logger.debug(f"Received request for Pokemon: {pokemon}")
     
-    if not is_valid_pokemon(pokemon):
+    canonical = canonicalize_pokemon(pokemon)
+    if canonical is None:
         logger.debug(f"Invalid Pokemon name: {pokemon}")
         return jsonify({"error": "Please enter a valid Pokémon name"}), 400
+    pokemon = canonical
 
     try:
-        metrics = metrics_collector.calculate_popularity_score(pokemon)
+        metrics = metrics_collector.get_popularity_score(pokemon)
+        # The weekly series is most of the payload, so it is only sent on request
+        if request.args.get('series') == '1':
+            metrics = metrics_collector.with_trend_series(metrics)
         logger.debug(f"Successfully calculated metrics for {pokemon}")
         return jsonify(metrics)
     except Exception as e:
         logger.error(f"Error calculating metrics for {pokemon}: {str(e)}")
         return jsonify({"error": "An error occurred while calculating metrics"}), 500
 
+def cacheable_json(data, degraded=False):
+    """Build a JSON response browsers and CDNs can cache, revalidate by ETag and get gzipped"""
+    body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    response = Response(body, mimetype='application/json')
+    # Weak, because the gzipped and plain bodies share it
+    response.set_etag(hashlib.sha1(body).hexdigest(), weak=True)
+    if degraded:
+        # Briefly, so a CDN does not keep serving it once the complete result is ready
+        response.headers['Cache-Control'] = f"public, max-age={CHART_CONFIG['degraded_max_age']}"
+    else:
+        response.headers['Cache-Control'] = (
+            f"public, max-age={CHART_CONFIG['max_age']}, "
+            f"stale-while-revalidate={CHART_CONFIG['stale_while_revalidate']}"
+        )
+    response.vary.add('Accept-Encoding')
+    response.make_conditional(request)  # 304 when If-None-Match matches
+
+    if (response.status_code == 200 and len(body) >= CHART_CONFIG['gzip_min_bytes']
+            and 'gzip' in request.accept_encodings):
+        response.set_data(gzip.compress(body, CHART_CONFIG['gzip_level']))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@app.route('/chart', methods=['GET'])
+def get_chart():
+    # Everything the web page shows, so browsers never call the upstream APIs
+    pokemon = request.args.get('pokemon')
+    if not pokemon:
+        return jsonify({"error": "Please provide a Pokémon name"}), 400
+
+    canonical = canonicalize_pokemon(pokemon)
+    if canonical is None:
+        return jsonify({"error": "Please enter a valid Pokémon name"}), 400
+
+    try:
+        result = metrics_collector.get_popularity_score(canonical)
+        return cacheable_json(metrics_collector.chart_data(result), degraded=is_degraded(result))
+    except Exception as e:
+        logger.error(f"Error building chart data for {canonical}: {str(e)}")
+        return jsonify({"error": "An error occurred while calculating metrics"}), 500
+
+@app.route('/metrics/batch', methods=['GET', 'POST'])
+def get_metrics_batch():
+    if request.method == 'POST':
+        payload = request.get_json(silent=True) or {}
+        pokemon_list = payload.get('pokemon')
+    else:
+        pokemon_list = request.args.getlist('pokemon')
+
+    if not pokemon_list or not isinstance(pokemon_list, list):
+        return jsonify({"error": "Please provide a list of Pokémon names"}), 400
+    if len(pokemon_list) > CONCURRENCY_CONFIG['max_batch_size']:
+        return jsonify({"error": f"At most {CONCURRENCY_CONFIG['max_batch_size']} Pokémon per batch"}), 400
+
+    logger.debug(f"Received batch request for {len(pokemon_list)} Pokemon")
+
+    invalid = []
+    valid = []
+    for pokemon in pokemon_list:
+        canonical = canonicalize_pokemon(pokemon) if isinstance(pokemon, str) else None
+        if canonical is None:
+            invalid.append(pokemon)
+        else:
+            valid.append(canonical)
+
+    def generate():
+        # One JSON document per line, in completion order
+        for pokemon in invalid:
+            yield json.dumps({"pokemon": pokemon, "error": "Please enter a valid Pokémon name"}) + "\n"
+        try:
+            for metrics in metrics_collector.calculate_popularity_scores(valid):
+                yield json.dumps(metrics) + "\n"
+        except Exception as e:
+            logger.error(f"Error calculating batch metrics: {str(e)}")
+            yield json.dumps({"error": "An error occurred while calculating metrics"}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/suggest', methods=['GET'])
+def get_suggestions():
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', default=MAX_SUGGESTIONS, type=int)
+    # A negative limit would slice from the end of the list
+    limit = min(max(limit, 1), MAX_SUGGESTIONS)
+    return jsonify({"query": query, "suggestions": suggest_pokemon(query, limit)})
+
+@app.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    top = request.args.get('top', default=10, type=int)
+    if top is None or top < 1:
+        return jsonify({"error": "top must be a positive integer"}), 400
+
+    entries = leaderboard.top(top)  # Also picks up a ranking saved by another worker
+    return jsonify({
+        "leaderboard": entries,
+        "ranked": len(leaderboard.ranking),
+        "total": len(leaderboard.pokemon_names),
+        "last_refresh": leaderboard.last_refresh
+    })
+
+def parse_time(value, default):
+    """Parse an epoch-seconds or ISO 8601 query parameter into epoch seconds"""
+    if not value:
+        return default.timestamp()
+    try:
+        seconds = float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+    # Rejects nan, inf and epochs past datetime's range, which the response formats as dates
+    try:
+        datetime.fromtimestamp(seconds)
+    except (OverflowError, OSError, ValueError):
+        raise ValueError(f"Time out of range: {value}")
+    return seconds
+
+@app.route('/history', methods=['GET'])
+def get_history():
+    pokemon = request.args.get('pokemon')
+    if not pokemon:
+        return jsonify({"error": "Please provide a Pokémon name"}), 400
+
+    canonical = canonicalize_pokemon(pokemon)
+    if canonical is None:
+        return jsonify({"error": "Please enter a valid Pokémon name"}), 400
+    if metrics_collector.history is None:
+        return jsonify({"error": "Score history is disabled"}), 404
+
+    try:
+        now = datetime.now()
+        end = parse_time(request.args.get('to'), now)
+        start = parse_time(request.args.get('from'), now - timedelta(days=30))
+    except ValueError:
+        return jsonify({"error": "from and to must be ISO 8601 dates or epoch seconds"}), 400
+    if start >= end:
+        return jsonify({"error": "from must be earlier than to"}), 400
+
+    points = request.args.get('points', default=HISTORY_CONFIG['max_points'], type=int)
+    points = max(1, min(points, HISTORY_CONFIG['max_points']))
+
+    return jsonify({
+        "pokemon": canonical,
+        "from": datetime.fromtimestamp(start).isoformat(),
+        "to": datetime.fromtimestamp(end).isoformat(),
+        "history": metrics_collector.history.query(canonical, start, end, points)
+    })
+
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    return Response(render_prometheus(metrics_collector), mimetype='text/plain; version=0.0.4')
+
+@app.route('/stats/coalescing', methods=['GET'])
+def get_coalescing_stats():
+    # The async group only sees traffic when served through asgi.py
+    sync_stats = metrics_collector.single_flight.stats()
+    async_stats = metrics_collector.async_single_flight.stats()
+    return jsonify({key: sync_stats[key] + async_stats[key] for key in sync_stats})
+
+@app.route('/stats/ratelimits', methods=['GET'])
+def get_rate_limit_stats():
+    return jsonify(metrics_collector.rate_limiter.remaining())
+
+@app.route('/stats/breakers', methods=['GET'])
+def get_breaker_stats():
+    return jsonify({
+        service: breaker.snapshot()
+        for service, breaker in metrics_collector.breakers.items()
+    })
+
 if __name__ == "__main__":
+    # Development server only; see asgi.py for production serving
     app.run(debug=True)
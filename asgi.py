@@ -0,0 +1,113 @@
+"""
+Production ASGI entry point
+/metrics is served natively on the event loop and awaits upstream work
+without holding a thread; every other route is passed through to the
+Flask app
+
+Launch with the configured worker count:
+    python asgi.py
+
+Or run uvicorn directly, which also reads WEB_CONCURRENCY:
+    WEB_CONCURRENCY=4 uvicorn asgi:application --log-level info
+
+HOST, PORT, WEB_CONCURRENCY and LOG_LEVEL override SERVER_CONFIG.
+
+Worker processes share nothing, so set the worker count through
+WEB_CONCURRENCY rather than --workers: each worker then takes
+1/WEB_CONCURRENCY of every rate limit, and only the worker holding the
+background lock runs the leaderboard refresher. Reddit scans stay per
+worker, within that worker's share of the Reddit limit. One worker is
+usually enough, since /metrics holds no thread while it waits.
+"""
+
+import json
+import logging
+import os
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app, metrics_collector, start_background_tasks
+from config import SERVER_CONFIG
+from pokemon_data import canonicalize_pokemon
+
+logger = logging.getLogger(__name__)
+
+flask_application = WsgiToAsgi(app)
+
+
+async def send_json(send, status: int, body: dict):
+    """Send a complete JSON response"""
+    payload = json.dumps(body).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode('ascii'))
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+async def metrics_endpoint(scope, send):
+    """Async equivalent of the Flask /metrics route"""
+    query = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+    pokemon = query.get('pokemon', [None])[0]
+    if not pokemon:
+        await send_json(send, 400, {"error": "Please provide a Pokémon name"})
+        return
+
+    canonical = canonicalize_pokemon(pokemon)
+    if canonical is None:
+        logger.debug(f"Invalid Pokemon name: {pokemon}")
+        await send_json(send, 400, {"error": "Please enter a valid Pokémon name"})
+        return
+
+    try:
+        metrics = await metrics_collector.get_popularity_score_async(canonical)
+        if query.get('series', [None])[0] == '1':
+            metrics = metrics_collector.with_trend_series(metrics)
+        await send_json(send, 200, metrics)
+    except Exception as e:
+        logger.error(f"Error calculating metrics for {canonical}: {str(e)}")
+        await send_json(send, 500, {"error": "An error occurred while calculating metrics"})
+
+
+async def lifespan(receive, send):
+    """Start background work when the worker boots"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            start_background_tasks()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """Route /metrics to the async handler and everything else to Flask"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['path'] == '/metrics' and scope['method'] == 'GET':
+        await metrics_endpoint(scope, send)
+    else:
+        await flask_application(scope, receive, send)
+
+
+def main():
+    """Launch uvicorn with one event loop per worker process"""
+    import uvicorn
+
+    uvicorn.run(
+        'asgi:application',
+        host=os.getenv('HOST', SERVER_CONFIG['host']),
+        port=int(os.getenv('PORT', SERVER_CONFIG['port'])),
+        workers=SERVER_CONFIG['workers'],
+        log_level=SERVER_CONFIG['log_level'].lower()
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Load-test benchmark for /metrics and /metrics/batch
+Runs the Flask app against the offline upstream simulator with a fresh
+cache, drives a workload at fixed concurrency and reports throughput,
+latency percentiles, upstream calls per request and memory
+
+    python benchmark.py --workload metrics --requests 500 --concurrency 16
+    python benchmark.py --workload batch --batch-size 25 --latency 0.1
+
+Results are written as JSON (benchmark_results/<commit>-<workload>.json by
+default) so runs can be compared across commits.
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+import requests
+
+from upstream_simulator import start_simulator
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = 'benchmark_results'
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Get a percentile of an already sorted list by nearest rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def git_commit() -> str:
+    """Get the short hash of the checked-out commit, or 'unknown'"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode('ascii').strip()
+    except Exception:
+        return 'unknown'
+
+
+def peak_rss_mb() -> float:
+    """Get this process's peak resident memory in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def start_app(base_url: str, work_dir: str, rate_limit_scale: float):
+    """Import the app pointed at the simulator with its state in work_dir, and serve it"""
+    os.environ['UPSTREAM_BASE_URL'] = base_url
+    # app.py reads credentials from the environment; any value works offline
+    os.environ.setdefault('REDDIT_CLIENT_ID', 'benchmark')
+    os.environ.setdefault('REDDIT_CLIENT_SECRET', 'benchmark')
+    os.environ.setdefault('YOUTUBE_API_KEY', 'benchmark')
+
+    import config
+    config.API_KEYS['reddit']['client_id'] = os.environ['REDDIT_CLIENT_ID']
+    config.API_KEYS['reddit']['client_secret'] = os.environ['REDDIT_CLIENT_SECRET']
+    config.CACHE_CONFIG['cache_dir'] = os.path.join(work_dir, 'cache')
+    config.HISTORY_CONFIG['db_path'] = os.path.join(work_dir, 'history.sqlite3')
+    config.WIKIPEDIA_CONFIG['store_dir'] = os.path.join(work_dir, 'wikipedia')
+    config.REDDIT_CONFIG['store_path'] = os.path.join(work_dir, 'reddit_posts.json')
+    config.LEADERBOARD_CONFIG['enabled'] = False  # Keep background traffic out of the numbers
+    config.LEADERBOARD_CONFIG['store_path'] = os.path.join(work_dir, 'leaderboard.json')
+    for limits in config.RATE_LIMITS.values():
+        for key in limits:
+            limits[key] = max(1, int(limits[key] * rate_limit_scale))
+
+    from werkzeug.serving import make_server
+    from app import app, metrics_collector
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='benchmark-app', daemon=True).start()
+    return server, metrics_collector
+
+
+def run_workload(url: str, workload: str, names: List[str], total: int,
+                 concurrency: int, batch_size: int) -> Dict:
+    """Send total requests with concurrency in flight; returns latencies and statuses"""
+    local = threading.local()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(i: int):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+
+        start = time.perf_counter()
+        try:
+            if workload == 'batch':
+                chunk = [names[(i * batch_size + j) % len(names)] for j in range(batch_size)]
+                response = session.post(f'{url}/metrics/batch', json={'pokemon': chunk})
+            else:
+                response = session.get(f'{url}/metrics', params={'pokemon': names[i % len(names)]})
+            response.content  # Read the whole (possibly streamed) body
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    return {'duration': time.perf_counter() - start, 'latencies': latencies, 'statuses': statuses}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workload', choices=('metrics', 'batch'), default='metrics')
+    parser.add_argument('--requests', type=int, default=300, help='Requests to send')
+    parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight')
+    parser.add_argument('--batch-size', type=int, default=25, help='Pokemon per batch request')
+    parser.add_argument('--names', type=int, default=151, help='Distinct Pokemon requested, cycled in order')
+    parser.add_argument('--warmup', type=int, default=0, help='Unmeasured requests sent first')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated upstream latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Simulated upstream error rate')
+    parser.add_argument('--youtube-quota', type=int, default=10000, help='Simulated YouTube quota units')
+    parser.add_argument('--rate-limit-scale', type=float, default=1.0,
+                        help='Multiplier for RATE_LIMITS, to measure the collector rather than the quotas')
+    parser.add_argument('--output', help='Result file (default benchmark_results/<commit>-<workload>.json)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # One line per request otherwise
+    simulator = start_simulator(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        youtube_quota=args.youtube_quota
+    )
+
+    work_dir = tempfile.mkdtemp(prefix='pokemon-benchmark-')
+    server, collector = start_app(simulator.base_url, work_dir, args.rate_limit_scale)
+    url = f'http://127.0.0.1:{server.server_port}'
+
+    from pokemon_data import VALID_POKEMON
+    names = sorted(VALID_POKEMON)[:args.names]
+
+    if args.warmup:
+        run_workload(url, args.workload, names, args.warmup, args.concurrency, args.batch_size)
+    simulator.reset()
+
+    run = run_workload(url, args.workload, names, args.requests, args.concurrency, args.batch_size)
+    upstream = simulator.stats()
+    server.shutdown()
+    # Fetches that missed their deadline may still be queued or running; drop
+    # the queued ones and let the running ones finish writing the cache
+    # before its directory is removed
+    pools = [collector.refresh_executor, collector.executor, collector.background_executor,
+             collector.async_executor, collector.batch_executor, collector.hedge_executor]
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+    latencies = sorted(run['latencies'])
+    pokemon_per_request = args.batch_size if args.workload == 'batch' else 1
+    result = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'parameters': vars(args),
+        'requests': len(latencies),
+        'duration_seconds': run['duration'],
+        'requests_per_second': len(latencies) / run['duration'] if run['duration'] else 0.0,
+        'pokemon_per_second': len(latencies) * pokemon_per_request / run['duration'] if run['duration'] else 0.0,
+        'latency_seconds': {
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'max': latencies[-1] if latencies else 0.0,
+            **{f'p{p}': percentile(latencies, p) for p in PERCENTILES}
+        },
+        'statuses': run['statuses'],
+        'upstream_calls': upstream['calls'],
+        'upstream_errors': upstream['errors'],
+        'upstream_calls_per_request': upstream['total_calls'] / len(latencies) if latencies else 0.0,
+        'youtube_quota_used': upstream['youtube_quota_used'],
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}-{args.workload}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    summary = {key: result[key] for key in ('requests_per_second', 'latency_seconds',
+                                            'upstream_calls_per_request', 'peak_rss_mb', 'statuses')}
+    print(json.dumps(summary, indent=2))
+    print(f'Results written to {output}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Tiered result cache for Pokemon popularity metrics
+Keeps a bounded in-process LRU tier in front of a persistent on-disk tier
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JsonCodec:
+    suffix = '.json'
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value as JSON"""
+        return json.dumps(value).encode('utf-8')
+
+    def decode(self, data: bytes) -> Any:
+        """Deserialize a JSON value"""
+        return json.loads(data)
+
+
+JSON_CODEC = JsonCodec()
+
+
+class TieredCache:
+    def __init__(self, cache_dir: str, ttls: Dict[str, int], default_ttl: int, max_entries: int,
+                 codecs: Optional[Dict[str, Any]] = None):
+        """Create a cache with per-namespace TTLs and a size-bounded memory tier"""
+        self.cache_dir = cache_dir
+        self.codecs = codecs or {}  # Namespaces stored in a format other than JSON
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.memory = OrderedDict()  # (namespace, key) -> (stored_at, value)
+        self.lock = threading.Lock()
+        self.counters = {}
+
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def ttl_for(self, namespace: str) -> int:
+        """Get the time-to-live in seconds for a namespace"""
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def cache_file(self, namespace: str, key: str) -> str:
+        """Get the on-disk path for a cache entry"""
+        safe_key = key.lower().replace('/', '_').replace(os.sep, '_')
+        return os.path.join(self.cache_dir, f'{namespace}_{safe_key}{self.codec_for(namespace).suffix}')
+
+    def codec_for(self, namespace: str):
+        """Get the on-disk codec for a namespace"""
+        return self.codecs.get(namespace, JSON_CODEC)
+
+    def count(self, namespace: str, counter: str):
+        """Increment a hit/miss/eviction counter (caller holds the lock)"""
+        counters = self.counters.setdefault(namespace, {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'evictions': 0
+        })
+        counters[counter] += 1
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Get a cached value if it is younger than the namespace TTL"""
+        entry = self.get_entry(namespace, key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, namespace: str, key: str, max_stale: float = 0) -> Optional[Tuple[Any, float]]:
+        """Get (value, age) for an entry up to max_stale seconds past its TTL"""
+        ttl = self.ttl_for(namespace)
+        max_age = ttl + max_stale
+        memory_key = (namespace, key.lower())
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(memory_key)
+            if entry is not None and now - entry[0] < max_age:
+                self.memory.move_to_end(memory_key)
+                self.count(namespace, 'memory_hits' if now - entry[0] < ttl else 'stale_hits')
+                return entry[1], now - entry[0]
+
+        value, stored_at = self.read_disk(namespace, key, max_age, now)
+
+        with self.lock:
+            if value is None:
+                self.count(namespace, 'misses')
+                return None
+            self.count(namespace, 'disk_hits' if now - stored_at < ttl else 'stale_hits')
+            self.store_memory(namespace, memory_key, stored_at, value)
+        return value, now - stored_at
+
+    def set(self, namespace: str, key: str, value: Any):
+        """Store a value in both tiers"""
+        with self.lock:
+            self.store_memory(namespace, (namespace, key.lower()), time.time(), value)
+
+        cache_file = self.cache_file(namespace, key)
+        # Written aside and renamed into place, so other threads and worker
+        # processes never read a partly written entry
+        temp_path = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            data = self.codec_for(namespace).encode(value)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, cache_file)
+        except Exception as e:
+            logger.error(f"Error saving to cache: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def store_memory(self, namespace: str, memory_key: tuple, stored_at: float, value: Any):
+        """Insert into the LRU tier, evicting the oldest entries (caller holds the lock)"""
+        self.memory[memory_key] = (stored_at, value)
+        self.memory.move_to_end(memory_key)
+        while len(self.memory) > self.max_entries:
+            (evicted_namespace, _), _ = self.memory.popitem(last=False)
+            self.count(evicted_namespace, 'evictions')
+
+    def read_disk(self, namespace: str, key: str, ttl: int, now: float) -> tuple:
+        """Read an entry from disk, using the file age for expiry"""
+        cache_file = self.cache_file(namespace, key)
+        try:
+            stored_at = os.path.getmtime(cache_file)
+        except OSError:
+            return None, None
+
+        if now - stored_at >= ttl:
+            return None, None
+
+        try:
+            with open(cache_file, 'rb') as f:
+                return self.codec_for(namespace).decode(f.read()), stored_at
+        except Exception as e:
+            logger.error(f"Error reading cache: {str(e)}")
+            return None, None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-namespace counters and the current memory tier size"""
+        with self.lock:
+            return {
+                'memory_entries': len(self.memory),
+                'memory_max_entries': self.max_entries,
+                'namespaces': {ns: dict(c) for ns, c in self.counters.items()}
+            }
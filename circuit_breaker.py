@@ -0,0 +1,151 @@
+"""
+Per-service circuit breakers and retry helpers for upstream calls
+After repeated failures a breaker opens and calls fail fast until a
+cool-down passes; one trial call then decides whether it closes again
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from rate_limiter import RateLimitedError
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+# Numeric encoding for the Prometheus gauge
+STATE_VALUES = {
+    STATE_CLOSED: 0,
+    STATE_HALF_OPEN: 1,
+    STATE_OPEN: 2
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, service: str, failure_threshold: int, reset_timeout: float):
+        """Create a closed breaker that opens after failure_threshold consecutive failures"""
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.opens = 0
+
+    def is_open(self) -> bool:
+        """Check whether calls would be rejected right now, without claiming a trial"""
+        with self.lock:
+            if self.state == STATE_OPEN:
+                return time.monotonic() - self.opened_at < self.reset_timeout
+            return self.state == STATE_HALF_OPEN and self.trial_in_flight
+
+    def allow(self) -> bool:
+        """Check whether a call may proceed; claims the trial call once the cool-down has passed"""
+        with self.lock:
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = STATE_HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == STATE_HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return self.state == STATE_CLOSED
+
+    def record_success(self):
+        """Close the breaker and reset the failure count"""
+        with self.lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure, opening the breaker at the threshold or after a failed trial"""
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    self.opens += 1
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+
+    def record_skipped(self):
+        """Forget a call that never reached the service, releasing a claimed trial"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the breaker's state and counters"""
+        with self.lock:
+            retry_in = 0.0
+            if self.state == STATE_OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'opens': self.opens,
+                'retry_in': retry_in
+            }
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """Get the HTTP status behind a requests, prawcore or googleapiclient error, if any"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+    return int(status) if status is not None else None
+
+
+def classify_error(error: Exception) -> Tuple[bool, bool]:
+    """Get (retryable, counts_as_failure) for an upstream error
+
+    Network errors, 5xx and 429 are transient and retried. Other 4xx
+    responses are answers rather than outages, except 403, which the
+    YouTube API uses for exhausted quota and should open the breaker.
+    """
+    status = error_status(error)
+    if status is None or status >= 500 or status == 429:
+        return True, True
+    return False, status == 403
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Get a full-jitter exponential backoff delay for a retry attempt"""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def call_with_retries(breaker: CircuitBreaker, fn: Callable[[], Any], max_retries: int,
+                      base_delay: float, max_delay: float, deadline: float) -> Any:
+    """Call fn through a breaker, retrying transient errors while the deadline allows"""
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {breaker.service}")
+        try:
+            result = fn()
+        except RateLimitedError:
+            # Our own budget ran out; says nothing about the service, and retrying will not help
+            breaker.record_skipped()
+            raise
+        except Exception as e:
+            retryable, counts = classify_error(e)
+            if counts:
+                breaker.record_failure()
+            else:
+                breaker.record_success()  # The service answered
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if not retryable or attempt >= max_retries or time.monotonic() + delay >= deadline:
+                raise
+            attempt += 1
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
@@ -3,6 +3,8 @@ Configuration file for Pokemon Popularity Metrics
 Contains API keys and other configuration settings
 """
 
+import os
+
 # API Keys and Authentication
 API_KEYS = {
     'reddit': {
@@ -23,14 +25,30 @@ METRIC_WEIGHTS = {
     'youtube': 0.20          # 20%
 }
 
+# Metric Sources (METRIC_SOURCES, comma separated, overrides 'enabled')
+# Disabled sources are never called or imported; the remaining weights are re-scaled
+SOURCES_CONFIG = {
+    'enabled': tuple(
+        name.strip() for name in
+        os.getenv('METRIC_SOURCES', 'google_trends,wikipedia,reddit,youtube').split(',')
+        if name.strip()
+    )
+}
+
 # API Rate Limiting Settings
 RATE_LIMITS = {
     'youtube': {
-        'requests_per_day': 10000,
+        'units_per_day': 10000,         # Data API quota; search costs 100 units, videos 1
         'requests_per_100seconds': 100
     },
     'reddit': {
         'requests_per_minute': 30
+    },
+    'wikipedia': {
+        'requests_per_second': 100   # Wikimedia REST API guideline
+    },
+    'google_trends': {
+        'requests_per_minute': 5     # Payloads; Google's limit is unpublished and 429s come early
     }
 }
 
@@ -38,7 +56,139 @@ RATE_LIMITS = {
 CACHE_CONFIG = {
     'enabled': True,
     'expire_after': 3600,  # Cache data for 1 hour
-    'cache_dir': 'cache'
+    'cache_dir': 'cache',
+    'memory_max_entries': 2048,  # Size bound for the in-process LRU tier
+    'source_ttls': {             # Per-source overrides of expire_after
+        'trends': 86400,         # Trends data only changes daily
+        'wikipedia': 3600,
+        'reddit': 1800,
+        'youtube': 3600,         # View and like counts
+        'youtube_ids': 604800,   # Search results (video ids); relevant videos rarely change
+        'score': 3600            # Complete /metrics results
+    },
+    'stale_grace': 21600         # Serve expired scores this long while refreshing
+}
+
+# Concurrent Collection Settings
+CONCURRENCY_CONFIG = {
+    'enabled': True,
+    'max_workers': 16,        # Thread pool for interactive source fetches
+    'background_workers': 16, # Batch and background source jobs, kept from queueing ahead of interactive ones
+    'async_workers': 128,     # Source fetches for async /metrics requests, one per in-flight call
+    'source_timeouts': {      # Per-source deadline in seconds
+        'google_trends': 5,
+        'wikipedia': 8,
+        'reddit': 8,
+        'youtube': 8
+    },
+    'refresh_workers': 4,     # Background stale-while-revalidate refreshes
+    'batch_workers': 16,      # Per-Pokemon calls inside batch jobs, e.g. YouTube searches
+    'batch_chunk_size': 25,   # Pokemon per batch-source job, so results stream as chunks finish
+    'batch_timeout': 120,     # Overall deadline for a /metrics/batch request; also bounds each batch or background source call
+    'max_batch_size': 151     # Enough to score every Gen 1 Pokemon at once
+}
+
+# HTTP Client Settings
+HTTP_CONFIG = {
+    'pool_connections': 4,    # Distinct hosts kept in each session's pool
+    'pool_maxsize': 16,       # Connections per host; matches the worker pool
+    'timeout': 10,            # Seconds before an upstream call is abandoned
+    'warm_up': False          # Build clients and open connections at startup
+}
+
+# Upstream Failure Handling Settings
+RESILIENCE_CONFIG = {
+    'failure_threshold': 5,   # Consecutive failures that open a service's breaker
+    'reset_timeout': 30,      # Seconds an open breaker fails fast before a trial call
+    'max_retries': 2,         # Extra attempts for transient errors, within the source deadline
+    'retry_base_delay': 0.2,  # Seconds; full-jitter backoff up to base * 2**attempt
+    'retry_max_delay': 2.0,
+    'hedge_after': 0.5,       # Seconds before a slow Wikimedia GET gets a second request
+    'hedge_max_share': 0.1    # Most hedged requests as a share of Wikimedia requests
+}
+
+# Google Trends Ingestion (fetch_pytrends.py)
+# Run it more often than the trends cache TTL, or scoring falls back to synthetic trends
+TRENDS_CONFIG = {
+    # In every payload; each payload is rescaled to match its series. Mid-popularity,
+    # so neither it nor the Pokemon compared with it round down to 0-1
+    'anchor': 'lapras',
+    'keywords_per_payload': 5,  # Google's comparison limit, anchor included
+    'timeframe': 'today 5-y',   # Weekly points, like the fallback series
+    'geo': '',                  # Worldwide
+    'max_retries': 4,           # Extra attempts for a payload after a 429, 5xx or network error
+    'retry_base_delay': 10,     # Seconds; full-jitter backoff up to base * 2**attempt
+    'retry_max_delay': 300,     # Also the breaker's reset timeout; the run stops once it opens
+    'payload_timeout': 900,     # Seconds one payload may spend retrying
+    # The anchor series of the last full run; subset runs are scaled to it
+    'reference_path': 'cache/trends_reference.json'
+}
+
+# Chart Endpoint Settings (/chart, used by the web page)
+CHART_CONFIG = {
+    'max_age': 300,                  # Seconds browsers and CDNs may reuse a response
+    'stale_while_revalidate': 3600,  # Seconds a CDN may serve it stale while refetching
+    'degraded_max_age': 15,          # For results built from stale data or missing a source
+    'gzip_min_bytes': 512,           # Smaller bodies are sent uncompressed
+    'gzip_level': 6,
+    'trend_decimals': 1              # Rounding of the weekly trend values
+}
+
+# Leaderboard Settings
+LEADERBOARD_CONFIG = {
+    'enabled': True,
+    'refresh_interval': 60,     # Seconds between refresh cycles
+    'max_batch_size': 10,       # Most Pokemon re-scored per cycle
+    'rate_budget_share': 0.5,   # Share of RATE_LIMITS the refresher may use
+    'store_path': 'cache/leaderboard.json'  # Read by server workers not running the refresher
+}
+
+# Score History Settings
+HISTORY_CONFIG = {
+    'enabled': True,
+    'db_path': 'cache/history.sqlite3',
+    'batch_size': 100,        # Most rows written per transaction
+    'flush_interval': 1.0,    # Seconds to wait for a batch to fill
+    'queue_size': 10000,      # Scores buffered before new ones are dropped
+    'max_points': 500         # Upper bound on points returned by /history
+}
+
+# Wikipedia pageview settings
+WIKIPEDIA_CONFIG = {
+    'store_dir': 'cache/wikipedia',  # Resolved titles and daily series
+    'window_days': 365,              # Days of daily views kept per article
+    'missing_title_ttl': 86400       # Seconds before a Pokemon without an article is looked up again
+}
+
+# Reddit aggregation settings
+REDDIT_CONFIG = {
+    'subreddits': 'pokemon+pokemongo+pokemontcg',
+    'store_path': 'cache/reddit_posts.json',
+    'window_days': 365,       # Posts counted in each Pokemon's totals
+    'scan_interval': 300,     # Seconds between scans of new posts
+    'rescan_hours': 24,       # Recent posts re-read each scan so their scores stay current
+    'max_pages': 10           # 100 posts per page; Reddit listings end near 1000 posts
+}
+
+# Upstream API endpoints; setting UPSTREAM_BASE_URL points every service at
+# one host, e.g. the local simulator started with `python upstream_simulator.py`
+UPSTREAM_BASE_URL = os.getenv('UPSTREAM_BASE_URL', '').rstrip('/')
+UPSTREAM_CONFIG = {
+    'wikimedia_url': f'{UPSTREAM_BASE_URL}/api/rest_v1' if UPSTREAM_BASE_URL else 'https://wikimedia.org/api/rest_v1',
+    'mediawiki_url': f'{UPSTREAM_BASE_URL}/w/api.php' if UPSTREAM_BASE_URL else 'https://en.wikipedia.org/w/api.php',
+    'reddit_url': UPSTREAM_BASE_URL or 'https://www.reddit.com',          # OAuth token endpoint
+    'reddit_oauth_url': UPSTREAM_BASE_URL or 'https://oauth.reddit.com',  # API calls
+    'youtube_url': f'{UPSTREAM_BASE_URL}/' if UPSTREAM_BASE_URL else 'https://youtube.googleapis.com/',
+    'trends_url': f'{UPSTREAM_BASE_URL}/trends' if UPSTREAM_BASE_URL else 'https://trends.google.com/trends'
+}
+
+# Production Server Settings (overridden by HOST, PORT, WEB_CONCURRENCY, LOG_LEVEL)
+SERVER_CONFIG = {
+    'host': '0.0.0.0',
+    'port': 8000,
+    # Worker processes; each gets an equal share of RATE_LIMITS (see asgi.py)
+    'workers': int(os.getenv('WEB_CONCURRENCY', '1')),
+    'log_level': 'INFO'
 }
 
 # Metric Normalization Factors
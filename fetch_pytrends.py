@@ -1,26 +1,236 @@
+"""
+Google Trends ingestion pipeline
+Queries Google Trends for up to keywords_per_payload Pokemon per payload,
+every payload sharing an anchor term. Each payload is rescaled so its
+anchor series matches the first payload's, which keeps values comparable
+across payloads, and the normalized weekly series are written to the
+trends cache that get_google_trends reads. Google reports integers
+relative to each payload's peak, so payloads group Pokemon of similar
+popularity (from the previous run) to keep the less popular ones from
+rounding to 0. A full run scales the overall peak to 100 and saves its
+anchor series; a run for some Pokemon is scaled to that saved series,
+so its values stay comparable with the rest of the cache
+
+    python fetch_pytrends.py                              # Every Pokemon, 38 payloads
+    python fetch_pytrends.py pikachu charizard "mr mime"  # Just these
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
 import time
-import random
+from typing import Callable, Dict, List, Optional
+
+import requests
 from pytrends.request import TrendReq
-import json
 
-def get_pokemon_trends(pokemon_list):
-    pytrends = TrendReq(hl='en-US', tz=360)  # Initialize pytrends here
+from circuit_breaker import CircuitBreaker, CircuitOpenError, call_with_retries
+from config import HTTP_CONFIG, RESILIENCE_CONFIG, TRENDS_CONFIG, UPSTREAM_CONFIG
+from pokemon_data import VALID_POKEMON, canonicalize_pokemon
+from rate_limiter import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+# pytrends hard-codes this host; requests are sent to UPSTREAM_CONFIG['trends_url'] instead
+DEFAULT_TRENDS_URL = TrendReq.GENERAL_URL.rsplit('/api/', 1)[0]
+
+
+class RoutedTrendReq(TrendReq):
+    def GetGoogleCookie(self):
+        """Get the NID cookie Google Trends expects from the configured host"""
+        response = requests.get(f"{UPSTREAM_CONFIG['trends_url']}/explore/?geo={self.hl[-2:]}",
+                                timeout=self.timeout)
+        return {name: value for name, value in response.cookies.items() if name == 'NID'}
+
+    def _get_data(self, url, method=TrendReq.GET_METHOD, trim_chars=0, **kwargs):
+        """Send a pytrends request to the configured host"""
+        url = url.replace(DEFAULT_TRENDS_URL, UPSTREAM_CONFIG['trends_url'], 1)
+        return super()._get_data(url, method, trim_chars, **kwargs)
+
+
+def plan_payloads(pokemon_list: List[str], anchor: str, size: int,
+                  popularity: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """Split Pokemon into payloads of at most size keywords, each led by the anchor
+
+    With known popularity, Pokemon of similar interest share a payload;
+    unknown ones are kept in order after the rest.
+    """
+    others = [pokemon for pokemon in dict.fromkeys(pokemon_list) if pokemon != anchor]
+    if popularity:
+        others.sort(key=lambda pokemon: (pokemon not in popularity, popularity.get(pokemon, 0.0)))
+    per_payload = size - 1
+    return [[anchor] + others[i:i + per_payload] for i in range(0, len(others), per_payload)] or [[anchor]]
+
+
+def fetch_payload(pytrends: TrendReq, keywords: List[str]) -> Dict[str, List[float]]:
+    """Get complete weeks of interest over time (0-100 within the payload) for each keyword"""
+    pytrends.build_payload(keywords, cat=0, timeframe=TRENDS_CONFIG['timeframe'],
+                           geo=TRENDS_CONFIG['geo'], gprop='')
+    data = pytrends.interest_over_time()
+    if data.empty:
+        return {}
+    # The current week is partial and would read as a drop
+    data = data[data['isPartial'].astype(str) != 'True']
+    return {keyword: data[keyword].astype(float).tolist() for keyword in keywords}
+
+
+def normalize_payloads(payloads: List[Dict[str, List[float]]], anchor: str,
+                       reference: Optional[List[float]] = None) -> Dict[str, List[float]]:
+    """Scale each payload so its anchor series matches the reference
+
+    Without a reference, the first payload's anchor is the reference and
+    the overall peak is then scaled to 100, as for a full run. A given
+    reference (a full run's anchor series) fixes the scale instead.
+    """
+    to_peak = reference is None
+    series = {}
+    for payload in payloads:
+        anchor_values = payload.get(anchor) or []
+        if reference is None and sum(anchor_values):
+            reference = anchor_values
+        # Compare the anchor over the weeks both payloads cover
+        overlap = min(len(reference or ()), len(anchor_values))
+        anchor_total = sum(anchor_values[-overlap:]) if overlap else 0
+        if not anchor_total:
+            logger.warning(f"Skipping trends payload without {anchor} data: {sorted(payload)}")
+            continue
+        scale = sum(reference[-overlap:]) / anchor_total
+        for keyword, values in payload.items():
+            series.setdefault(keyword, [value * scale for value in values])
+
+    if not to_peak:
+        return {keyword: [round(value, 2) for value in values] for keyword, values in series.items()}
+    peak = max((max(values) for values in series.values() if values), default=0)
+    if not peak:
+        return {}
+    return {keyword: [round(value * 100 / peak, 2) for value in values] for keyword, values in series.items()}
 
-    trends = {}
+
+def load_reference(anchor: str) -> Optional[List[float]]:
+    """Get the anchor series saved by the last full run, if it used this anchor"""
+    try:
+        with open(TRENDS_CONFIG['reference_path'], 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error reading {TRENDS_CONFIG['reference_path']}: {str(e)}")
+        return None
+    return data['values'] if data.get('anchor') == anchor else None
+
+
+def save_reference(anchor: str, values: List[float]):
+    """Save a full run's anchor series for later subset runs"""
+    path = TRENDS_CONFIG['reference_path']
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'anchor': anchor, 'values': values}, f)
+    os.replace(temp_path, path)
+
+
+def get_pokemon_trends(pokemon_list: List[str], acquire: Optional[Callable[[], object]] = None,
+                       popularity: Optional[Dict[str, float]] = None,
+                       reference: Optional[List[float]] = None) -> Dict[str, List[float]]:
+    """Get comparable weekly Google Trends series for Pokemon; acquire() is called before each payload
+
+    The result includes the anchor's series, whether or not it was requested.
+    """
+    anchor = TRENDS_CONFIG['anchor']
+    pytrends = RoutedTrendReq(hl='en-US', tz=360, timeout=HTTP_CONFIG['timeout'])
+    # Consecutive failures open the breaker; the run then stops instead of hammering Google
+    breaker = CircuitBreaker(
+        'google_trends',
+        failure_threshold=RESILIENCE_CONFIG['failure_threshold'],
+        reset_timeout=TRENDS_CONFIG['retry_max_delay']
+    )
+
+    def attempt(keywords: List[str]) -> Dict[str, List[float]]:
+        if acquire is not None:
+            acquire()
+        return fetch_payload(pytrends, keywords)
+
+    plan = plan_payloads(pokemon_list, anchor, TRENDS_CONFIG['keywords_per_payload'], popularity)
+    payloads = []
+    for index, keywords in enumerate(plan):
+        try:
+            payloads.append(call_with_retries(
+                breaker,
+                lambda: attempt(keywords),
+                max_retries=TRENDS_CONFIG['max_retries'],
+                base_delay=TRENDS_CONFIG['retry_base_delay'],
+                max_delay=TRENDS_CONFIG['retry_max_delay'],
+                deadline=time.monotonic() + TRENDS_CONFIG['payload_timeout']
+            ))
+        except CircuitOpenError:
+            logger.error(f"Google Trends keeps failing; stopping with {len(plan) - index} payloads left")
+            break
+        except Exception as e:
+            logger.error(f"Error fetching trends for {keywords}: {str(e)}")
+
+    logger.info(f"Fetched {len(payloads)} of {len(plan)} Google Trends payloads")
+    requested = set(pokemon_list) | {anchor}
+    return {pokemon: values for pokemon, values in normalize_payloads(payloads, anchor, reference).items()
+            if pokemon in requested}
+
+
+def ingest_trends(collector, pokemon_list: List[str]) -> Dict[str, List[float]]:
+    """Fetch trends through the collector's rate limiter and write them to its trends cache"""
+    anchor = TRENDS_CONFIG['anchor']
+    full_run = set(pokemon_list) >= VALID_POKEMON
+    reference = None
+    if not full_run:
+        reference = load_reference(anchor)
+        if reference is None:
+            logger.error(f"No saved {anchor} series to scale against; run fetch_pytrends.py for every Pokemon first")
+            return {}
+
+    popularity = {}
     for pokemon in pokemon_list:
-        pytrends.build_payload([pokemon], cat=0, timeframe='today 5-y', geo='', gprop='')  # Build payload
-        data = pytrends.interest_over_time()  # Get the trend data
-
-        # Check if the data frame is empty or has no results
-        if data.empty:
-            trends[pokemon] = "No data available"
-        else:
-            # You can either get the values directly or return the data in the correct format
-            trends[pokemon] = data[pokemon].values.tolist()  # List of trends for the Pokémon
-    
+        series = collector.get_cached_trends(pokemon)
+        if series is not None and not series.is_fallback:
+            popularity[pokemon] = series.avg_value
+    trends = get_pokemon_trends(
+        pokemon_list,
+        acquire=lambda: collector.rate_limiter.acquire('google_trends', PRIORITY_BACKGROUND),
+        popularity=popularity,
+        reference=reference
+    )
+    if full_run and anchor in trends:
+        save_reference(anchor, trends[anchor])
+
+    trends = {pokemon: values for pokemon, values in trends.items() if pokemon in pokemon_list}
+    for pokemon, values in trends.items():
+        collector.save_to_cache(pokemon, {'trend_values': values})
+    missing = sorted(set(pokemon_list) - set(trends))
+    if missing:
+        # Scoring leaves synthetic fallback trends out, so these count only other sources
+        logger.warning(f"No Google Trends data for {len(missing)} Pokemon: {', '.join(missing)}")
     return trends
 
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pokemon', nargs='*', help='Pokemon to refresh (default all)')
+    args = parser.parse_args(argv)
+
+    canonical = [canonicalize_pokemon(name) for name in args.pokemon]
+    unknown = [name for name, pokemon in zip(args.pokemon, canonical) if pokemon is None]
+    if unknown:
+        parser.error(f"unknown Pokemon: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO)
+    from metrics_collector import PokemonMetricsCollector
+
+    pokemon_list = canonical or sorted(VALID_POKEMON)
+    trends = ingest_trends(PokemonMetricsCollector(), pokemon_list)
+    summary = {pokemon: round(sum(values) / len(values), 2) if values else 0.0
+               for pokemon, values in sorted(trends.items())}
+    print(json.dumps({'saved': len(trends), 'missing': sorted(set(pokemon_list) - set(trends)),
+                      'avg_value': summary}, indent=2))
+
+
 if __name__ == "__main__":
-    pokemon_list = ["Pikachu", "Charizard", "Bulbasaur"]
-    trends = get_pokemon_trends(pokemon_list)
-    print(json.dumps(trends, indent=2))
+    main()
@@ -0,0 +1,117 @@
+"""
+Append-only history of computed popularity scores
+Scores are queued by the request path and written to SQLite in batches
+by a background thread
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ('google_trends', 'wikipedia', 'reddit', 'youtube')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    pokemon TEXT NOT NULL,
+    ts REAL NOT NULL,
+    total_score REAL NOT NULL,
+    google_trends REAL,
+    wikipedia REAL,
+    reddit REAL,
+    youtube REAL
+);
+CREATE INDEX IF NOT EXISTS scores_pokemon_ts ON scores (pokemon, ts);
+"""
+
+
+class ScoreHistory:
+    def __init__(self, db_path: str, batch_size: int = 100, flush_interval: float = 1.0,
+                 queue_size: int = 10000):
+        """Create a history store; the writer thread starts on the first record"""
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.dropped = 0
+
+        with closing(self.connect()) as connection:
+            connection.executescript(SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection; WAL lets queries run while the writer commits"""
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+    def record(self, result: Dict[str, Any]):
+        """Queue a computed score for writing without blocking the caller"""
+        components = result['score_components']
+        row = (
+            result['pokemon'],
+            datetime.fromisoformat(result['timestamp']).timestamp(),
+            result['total_score'],
+            *(components.get(name) for name in COMPONENTS)
+        )
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"History queue full, dropped score for {result['pokemon']}")
+            return
+
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, name='history-writer', daemon=True)
+                    self.thread.start()
+
+    def run(self):
+        """Drain the queue, writing rows in batches"""
+        connection = self.connect()
+        while True:
+            rows = [self.queue.get()]
+            try:
+                while len(rows) < self.batch_size:
+                    rows.append(self.queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            try:
+                with connection:
+                    connection.executemany(
+                        'INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+                    )
+            except Exception as e:
+                logger.error(f"Error writing score history: {str(e)}")
+
+    def query(self, pokemon: str, start: float, end: float, max_points: int) -> List[Dict[str, Any]]:
+        """Get scores between two timestamps, averaged into at most max_points buckets"""
+        width = max((end - start) / max_points, 1e-6)
+        averages = ', '.join(f'AVG({name})' for name in COMPONENTS)
+        sql = f"""
+            SELECT MIN(CAST((ts - ?) / ? AS INTEGER), ?) AS bucket, COUNT(*), AVG(total_score), {averages}
+            FROM scores
+            WHERE pokemon = ? AND ts >= ? AND ts <= ?
+            GROUP BY bucket
+            ORDER BY bucket
+        """
+        with closing(self.connect()) as connection:
+            rows = connection.execute(sql, (start, width, max_points - 1, pokemon, start, end)).fetchall()
+
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(start + bucket * width).isoformat(),
+                'samples': samples,
+                'total_score': total_score,
+                'score_components': dict(zip(COMPONENTS, components))
+            }
+            for bucket, samples, total_score, *components in rows
+        ]
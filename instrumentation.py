@@ -0,0 +1,174 @@
+"""
+Latency, outcome and traffic instrumentation for metric sources
+Rendered in the Prometheus text exposition format at /stats
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Tuple
+
+from circuit_breaker import STATE_VALUES
+
+# Upper bounds in seconds for latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+OUTCOME_SUCCESS = 'success'
+OUTCOME_ERROR = 'error'
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_REJECTED = 'rejected'  # Skipped because the service's circuit breaker was open
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        """Create an empty histogram over LATENCY_BUCKETS plus +Inf"""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                if i == len(LATENCY_BUCKETS):
+                    return lower  # Beyond the last bound, report the bound
+                upper = LATENCY_BUCKETS[i]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return LATENCY_BUCKETS[-1]
+
+
+class Instrumentation:
+    def __init__(self):
+        """Create empty latency, outcome and byte counters"""
+        self.lock = threading.Lock()
+        self.latency: Dict[str, Histogram] = {}
+        self.outcomes: Dict[Tuple[str, str], int] = {}
+        self.upstream_bytes: Dict[str, int] = {}
+
+    def observe(self, operation: str, seconds: float, outcome: str = OUTCOME_SUCCESS):
+        """Record the latency and outcome of one operation"""
+        with self.lock:
+            histogram = self.latency.get(operation)
+            if histogram is None:
+                histogram = self.latency[operation] = Histogram()
+            histogram.observe(seconds)
+            key = (operation, outcome)
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+
+    def count(self, operation: str, outcome: str):
+        """Record an outcome with no latency, e.g. a missed deadline"""
+        with self.lock:
+            key = (operation, outcome)
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+
+    def record_bytes(self, service: str, size: int):
+        """Add to the bytes received from an upstream service"""
+        with self.lock:
+            self.upstream_bytes[service] = self.upstream_bytes.get(service, 0) + size
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """Format a Prometheus label set"""
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+
+def render_prometheus(collector) -> str:
+    """Render every collector metric in the Prometheus text format"""
+    instrumentation = collector.instrumentation
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[Tuple[Dict[str, str], float]]):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{name}{format_labels(labels) if labels else ""} {value}')
+
+    with instrumentation.lock:
+        histograms = {op: (list(h.counts), h.sum, h.count, [h.quantile(q) for q in QUANTILES])
+                      for op, h in instrumentation.latency.items()}
+        outcomes = dict(instrumentation.outcomes)
+        upstream_bytes = dict(instrumentation.upstream_bytes)
+
+    lines.append('# HELP pokemon_operation_latency_seconds Latency of source calls and score computations')
+    lines.append('# TYPE pokemon_operation_latency_seconds histogram')
+    for operation, (counts, total, count, _) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS + ('+Inf',), counts):
+            cumulative += bucket_count
+            labels = format_labels({'operation': operation, 'le': bound})
+            lines.append(f'pokemon_operation_latency_seconds_bucket{labels} {cumulative}')
+        labels = format_labels({'operation': operation})
+        lines.append(f'pokemon_operation_latency_seconds_sum{labels} {total}')
+        lines.append(f'pokemon_operation_latency_seconds_count{labels} {count}')
+
+    metric('pokemon_operation_latency_quantile_seconds', 'gauge',
+           'Estimated latency quantiles (p50/p95/p99) from the histogram buckets',
+           [({'operation': op, 'quantile': q}, value)
+            for op, (_, _, _, estimates) in sorted(histograms.items())
+            for q, value in zip(QUANTILES, estimates)])
+
+    metric('pokemon_operation_total', 'counter', 'Operations by outcome (success, error, timeout, rejected)',
+           [({'operation': op, 'outcome': outcome}, value)
+            for (op, outcome), value in sorted(outcomes.items())])
+
+    metric('pokemon_upstream_bytes_total', 'counter', 'Response bytes received from upstream APIs',
+           [({'service': service}, value) for service, value in sorted(upstream_bytes.items())])
+
+    cache_stats = collector.cache.stats()
+    namespaces = sorted(cache_stats['namespaces'].items())
+    metric('pokemon_cache_hits_total', 'counter', 'Cache hits by tier',
+           [({'namespace': ns, 'tier': tier}, counters[f'{tier}_hits'])
+            for ns, counters in namespaces for tier in ('memory', 'disk', 'stale')])
+    metric('pokemon_cache_misses_total', 'counter', 'Cache misses',
+           [({'namespace': ns}, counters['misses']) for ns, counters in namespaces])
+    metric('pokemon_cache_evictions_total', 'counter', 'Entries evicted from the memory tier',
+           [({'namespace': ns}, counters['evictions']) for ns, counters in namespaces])
+    metric('pokemon_cache_hit_ratio', 'gauge', 'Share of lookups served from either tier',
+           [({'namespace': ns}, hit_ratio(counters)) for ns, counters in namespaces])
+    metric('pokemon_cache_memory_entries', 'gauge', 'Entries held in the memory tier',
+           [({}, cache_stats['memory_entries'])])
+
+    coalesced = (collector.single_flight.stats()['coalesced_requests']
+                 + collector.async_single_flight.stats()['coalesced_requests'])
+    metric('pokemon_coalesced_requests_total', 'counter',
+           'Requests that shared an in-flight computation', [({}, coalesced)])
+
+    budget = collector.rate_limiter.remaining()
+    metric('pokemon_rate_limit_tokens', 'gauge', 'Tokens left in each rate limit bucket',
+           [({'service': service, 'limit': limit}, tokens)
+            for service, buckets in sorted(budget.items())
+            for limit, tokens in sorted(buckets.items()) if limit != 'queued'])
+    metric('pokemon_rate_limit_queued', 'gauge', 'Calls waiting for rate limit tokens',
+           [({'service': service}, buckets['queued']) for service, buckets in sorted(budget.items())])
+
+    breakers = sorted((service, breaker.snapshot()) for service, breaker in collector.breakers.items())
+    metric('pokemon_circuit_breaker_state', 'gauge', 'Breaker state (0 closed, 1 half open, 2 open)',
+           [({'service': service}, STATE_VALUES[snapshot['state']]) for service, snapshot in breakers])
+    metric('pokemon_circuit_breaker_opens_total', 'counter', 'Times each breaker has opened',
+           [({'service': service}, snapshot['opens']) for service, snapshot in breakers])
+    metric('pokemon_hedged_requests_total', 'counter', 'Slow Wikimedia requests that were sent twice',
+           [({}, collector.wikimedia_hedges)])
+
+    return '\n'.join(lines) + '\n'
+
+
+def hit_ratio(counters: Dict[str, int]) -> float:
+    """Get the share of cache lookups that were hits"""
+    hits = counters['memory_hits'] + counters['disk_hits'] + counters['stale_hits']
+    lookups = hits + counters['misses']
+    return hits / lookups if lookups else 0.0
@@ -0,0 +1,170 @@
+"""
+Precomputed popularity leaderboard
+A background thread keeps scores for every Pokemon fresh, stalest first,
+within the request budget left over by interactive traffic. The ranking
+is saved after each cycle, so server workers without the refresher (and
+restarts) serve the same leaderboard
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from config import LEADERBOARD_CONFIG, RATE_LIMITS, SERVER_CONFIG
+from metrics_collector import YOUTUBE_SEARCH_COST, YOUTUBE_VIDEOS_COST
+from rate_limiter import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+
+class Leaderboard:
+    def __init__(self, collector, pokemon_names: Iterable[str]):
+        """Create an empty leaderboard over the given Pokemon"""
+        self.collector = collector
+        self.pokemon_names = sorted(pokemon_names)
+        self.refresh_interval = LEADERBOARD_CONFIG['refresh_interval']
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.ranking: List[Dict[str, Any]] = []  # Replaced wholesale, never mutated
+        self.last_refresh = None
+        self.youtube_credit = [0.0, 0.0]  # Unspent YouTube (units, requests) carried between cycles
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.store_path = LEADERBOARD_CONFIG['store_path']
+        self.loaded_mtime = None
+        self.sync()
+
+    def save(self):
+        """Write the ranking atomically for other worker processes"""
+        directory = os.path.dirname(self.store_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{self.store_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'ranking': self.ranking, 'last_refresh': self.last_refresh}, f)
+            os.replace(temp_path, self.store_path)
+        except Exception as e:
+            logger.error(f"Error writing {self.store_path}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def sync(self):
+        """Load the saved ranking if it changed, unless this process is the one refreshing it"""
+        if self.thread and self.thread.is_alive():
+            return
+        try:
+            mtime = os.path.getmtime(self.store_path)
+            if mtime == self.loaded_mtime:
+                return
+            with open(self.store_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error reading {self.store_path}: {str(e)}")
+            return
+        self.ranking = data['ranking']
+        self.last_refresh = data['last_refresh']
+        self.entries = {
+            entry['pokemon']: {key: value for key, value in entry.items() if key != 'rank'}
+            for entry in self.ranking
+        }
+        self.loaded_mtime = mtime
+
+    def youtube_budget(self) -> Tuple[float, float]:
+        """Get the YouTube (units, requests) one cycle may spend within its share of RATE_LIMITS"""
+        # This worker's limiter only has its share of the quotas (see asgi.py)
+        scale = LEADERBOARD_CONFIG['rate_budget_share'] * self.refresh_interval / SERVER_CONFIG['workers']
+        return (RATE_LIMITS['youtube']['units_per_day'] * scale / 86400,
+                RATE_LIMITS['youtube']['requests_per_100seconds'] * scale / 100)
+
+    def youtube_cost(self, pokemon: str) -> Tuple[int, int]:
+        """Get the YouTube (units, requests) scoring a Pokemon costs at most"""
+        # One videos().list call, plus a 100-unit search when the video ids
+        # are not cached; Reddit is read from the shared aggregate
+        if self.collector.has_youtube_ids(pokemon):
+            return YOUTUBE_VIDEOS_COST, 1
+        return YOUTUBE_SEARCH_COST + YOUTUBE_VIDEOS_COST, 2
+
+    def next_batch(self) -> List[str]:
+        """Get the stalest Pokemon whose scores fit the YouTube budget saved up so far"""
+        candidates = self.stalest(LEADERBOARD_CONFIG['max_batch_size'])
+        if 'youtube' not in self.collector.sources:
+            return candidates
+
+        # Unspent budget carries over, so a search is staggered across the cycles
+        # it takes to afford; the cap keeps idle time from building a burst
+        budget = self.youtube_budget()
+        search = (YOUTUBE_SEARCH_COST + YOUTUBE_VIDEOS_COST, 2)
+        credit = [min(saved + earned, max(earned, cost))
+                  for saved, earned, cost in zip(self.youtube_credit, budget, search)]
+
+        batch = []
+        for pokemon in candidates:
+            cost = self.youtube_cost(pokemon)
+            if any(c > available for c, available in zip(cost, credit)):
+                break  # Stalest first, so later Pokemon wait rather than overtake
+            credit = [available - c for available, c in zip(credit, cost)]
+            batch.append(pokemon)
+        self.youtube_credit = credit
+        return batch
+
+    def stalest(self, count: int) -> List[str]:
+        """Get the Pokemon whose scores are oldest, never-scored ones first"""
+        def updated_at(pokemon):
+            entry = self.entries.get(pokemon)
+            return entry['updated_at'] if entry else 0
+        return sorted(self.pokemon_names, key=updated_at)[:count]
+
+    def refresh_once(self) -> int:
+        """Re-score the stalest Pokemon and rebuild the ranking"""
+        batch = self.next_batch()
+        if not batch:
+            logger.debug("Saving YouTube budget for the next leaderboard search")
+            return 0
+        logger.debug(f"Refreshing leaderboard entries: {', '.join(batch)}")
+
+        refreshed = 0
+        for metrics in self.collector.calculate_popularity_scores(batch, PRIORITY_BACKGROUND):
+            self.entries[metrics['pokemon']] = {
+                'pokemon': metrics['pokemon'],
+                'total_score': metrics['total_score'],
+                'score_components': metrics['score_components'],
+                'updated_at': time.time()
+            }
+            refreshed += 1
+
+        ranking = sorted(self.entries.values(), key=lambda e: e['total_score'], reverse=True)
+        self.ranking = [dict(entry, rank=i + 1) for i, entry in enumerate(ranking)]
+        self.last_refresh = time.time()
+        self.save()
+        return refreshed
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        """Get the n highest-scoring entries"""
+        self.sync()
+        return self.ranking[:n]
+
+    def run(self):
+        """Refresh loop for the background thread"""
+        while not self.stop_event.is_set():
+            try:
+                self.refresh_once()
+            except Exception as e:
+                logger.error(f"Error refreshing leaderboard: {str(e)}")
+            self.stop_event.wait(self.refresh_interval)
+
+    def start(self):
+        """Start the background refresher if it is not already running"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='leaderboard-refresh', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background refresher"""
+        self.stop_event.set()
@@ -1,66 +1,417 @@
 import time
-import random
-from pytrends.request import TrendReq
 import requests
-from datetime import datetime, timedelta
-import json
-import os
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+import threading
+from datetime import datetime
+import copy
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
-import praw  # For Reddit API
-import tweepy  # For Twitter API
-from bs4 import BeautifulSoup
+import asyncio
+# API client libraries (praw, googleapiclient, httplib2, tweepy) and numpy are
+# imported on first use of the source that needs them, keeping startup fast
 from config import (
     API_KEYS, 
     METRIC_WEIGHTS, 
     RATE_LIMITS, 
     CACHE_CONFIG, 
     NORMALIZATION, 
-    ERROR_MESSAGES
+    ERROR_MESSAGES,
+    CONCURRENCY_CONFIG,
+    HTTP_CONFIG,
+    HISTORY_CONFIG,
+    WIKIPEDIA_CONFIG,
+    UPSTREAM_CONFIG,
+    RESILIENCE_CONFIG,
+    REDDIT_CONFIG,
+    SOURCES_CONFIG,
+    CHART_CONFIG,
+    SERVER_CONFIG
+)
+from cache import TieredCache
+from circuit_breaker import CircuitBreaker, call_with_retries
+from wikipedia_views import WikipediaPageviews
+from reddit_aggregator import Post, RedditAggregator
+from instrumentation import Instrumentation, OUTCOME_ERROR, OUTCOME_REJECTED, OUTCOME_SUCCESS, OUTCOME_TIMEOUT
+from history import ScoreHistory
+from singleflight import AsyncSingleFlight, SingleFlight
+from trend_series import TrendSeries, TrendSeriesCodec
+from rate_limiter import RateLimitedError, RateLimitScheduler, PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BACKGROUND
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed, wait
 )
-from googleapiclient.discovery import build
-import math
 
 logger = logging.getLogger(__name__)
 
+# YouTube videos().list accepts at most 50 ids per call
+YOUTUBE_IDS_PER_CALL = 50
+
+# YouTube Data API quota units charged per call
+YOUTUBE_SEARCH_COST = 100
+YOUTUBE_VIDEOS_COST = 1
+
+# Cache namespace for each Pokemon's YouTube search result (its video ids)
+YOUTUBE_IDS_NAMESPACE = 'youtube_ids'
+
+# Headers sent with every Wikimedia request
+WIKIMEDIA_HEADERS = {
+    'User-Agent': 'PokemonPopularityApp/1.0 (https://github.com/yourusername/pokemon-popularity; your@email.com)',
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Cache namespace used for each source's results; trends are cached as
+# compact series in TRENDS_NAMESPACE and summarized on every read
+CACHE_NAMESPACES = {
+    'wikipedia': 'wikipedia',
+    'reddit': 'reddit',
+    'youtube': 'youtube'
+}
+
+# Sources backed by an upstream service, each behind its own circuit breaker
+UPSTREAM_SOURCES = ('wikipedia', 'reddit', 'youtube')
+
+# Cache namespace for trend series, stored in the binary TrendSeriesCodec format
+TRENDS_NAMESPACE = 'trends'
+
+# Cache namespace for complete popularity score results
+SCORE_NAMESPACE = 'score'
+
+# Results reported for a source that failed or missed its deadline
+EMPTY_METRICS = {
+    'google_trends': {
+        'max_value': 0,
+        'avg_value': 0.0,
+        'success': False
+    },
+    'wikipedia': {
+        'total_views': 0,
+        'monthly_avg': 0.0,
+        'success': False
+    },
+    'reddit': {
+        'total_posts': 0,
+        'total_upvotes': 0,
+        'avg_upvotes': 0.0,
+        'success': False
+    },
+    'youtube': {
+        'total_videos': 0,
+        'total_views': 0,
+        'total_likes': 0,
+        'avg_views': 0,
+        'success': False
+    }
+}
+
+# The metrics the web page shows for each source, the only ones /chart sends
+CHART_FIELDS = {
+    'google_trends': ('avg_value',),
+    'wikipedia': ('monthly_avg', 'total_views'),
+    'reddit': ('total_posts', 'total_upvotes', 'avg_upvotes'),
+    'youtube': ('total_videos', 'total_views', 'avg_views', 'total_likes')
+}
+
+# Each source's share of the score, from its metrics normalized to 0..1
+SCORE_NORMALIZERS = {
+    'google_trends': lambda m: m['avg_value'] / 100,
+    'wikipedia': lambda m: min(m['monthly_avg'] / NORMALIZATION['wikipedia_views'], 1),
+    'reddit': lambda m: min(m['avg_upvotes'] / NORMALIZATION['reddit_upvotes'], 1),
+    'youtube': lambda m: min(m['avg_views'] / NORMALIZATION['youtube_views'], 1)
+}
+
+def is_degraded(result: Dict[str, Any]) -> bool:
+    """Check whether a score is stale or built without a working answer from every source"""
+    return bool(result.get('stale') or result['timed_out_sources'] or any(
+        not metrics.get('success', True) or metrics.get('stale') for metrics in result['metrics'].values()
+    ))
+
+class CountingHttp:
+    def __init__(self, http, on_response):
+        """Wrap an httplib2 connection to report each response body size"""
+        self.http = http
+        self.on_response = on_response
+
+    def request(self, *args, **kwargs):
+        response, content = self.http.request(*args, **kwargs)
+        self.on_response(len(content or b''))
+        return response, content
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
 class PokemonMetricsCollector:
     def __init__(self):
         """Initialize the collector with only necessary services"""
-        self.initialize_pytrends()
+        self.instrumentation = Instrumentation()
+        self.initialize_cache()
+        self.initialize_http()
+        self.initialize_executor()
         self.initialize_reddit()
+        self.initialize_history()
+        self.single_flight = SingleFlight()
+        self.async_single_flight = AsyncSingleFlight()
+        # Every server worker has its own limiter, so each takes a share of the quotas
+        self.rate_limiter = RateLimitScheduler(RATE_LIMITS, shares=SERVER_CONFIG['workers'])
+        self.breakers = {
+            service: CircuitBreaker(
+                service,
+                failure_threshold=RESILIENCE_CONFIG['failure_threshold'],
+                reset_timeout=RESILIENCE_CONFIG['reset_timeout']
+            )
+            for service in UPSTREAM_SOURCES
+        }
+        self.wikimedia_requests = 0
+        self.wikimedia_hedges = 0
+        # Disabled sources are never called, so their client libraries are never imported
+        enabled = SOURCES_CONFIG['enabled']
+        self.sources = {name: fetch for name, fetch in {
+            'google_trends': self.get_google_trends,
+            'wikipedia': self.get_wikipedia_views,
+            'reddit': self.get_reddit_metrics,
+            'youtube': self.get_youtube_metrics
+        }.items() if name in enabled}
+        # Sources that can fetch many Pokemon with fewer upstream calls
+        self.batch_sources = {name: fetch for name, fetch in {
+            'google_trends': self.get_google_trends_batch,
+            'wikipedia': self.get_wikipedia_views_batch,
+            'youtube': self.get_youtube_metrics_batch
+        }.items() if name in enabled}
         # Remove Twitter initialization since we're not using it
         # self.initialize_twitter()
         # Initialize other API clients here
         # self.twitter_api = ...
         # self.reddit_api = ...
     
-    def initialize_pytrends(self):
-        """Initialize pytrends with caching but without testing connection"""
-        # Create cache directory if it doesn't exist
-        if not os.path.exists('cache'):
-            os.makedirs('cache')
-        
-        # Don't initialize or test pytrends at startup
-        self.pytrends = None
-        self.use_cache = True
+    def initialize_cache(self):
+        """Create the result cache shared by every source; creates the cache directory"""
+        self.cache = TieredCache(
+            cache_dir=CACHE_CONFIG['cache_dir'],
+            ttls=CACHE_CONFIG['source_ttls'],
+            default_ttl=CACHE_CONFIG['expire_after'],
+            max_entries=CACHE_CONFIG['memory_max_entries'],
+            codecs={TRENDS_NAMESPACE: TrendSeriesCodec()}
+        )
+        self.use_cache = CACHE_CONFIG['enabled']
 
-    def initialize_reddit(self):
-        """Initialize Reddit API client"""
-        try:
-            self.reddit = praw.Reddit(
-                client_id=API_KEYS['reddit']['client_id'],
-                client_secret=API_KEYS['reddit']['client_secret'],
-                user_agent=API_KEYS['reddit']['user_agent'],
-                read_only=True
+    def initialize_http(self):
+        """Create long-lived pooled HTTP clients shared by every request"""
+        self.session = self.build_session('wikipedia')
+        self.session.headers.update(WIKIMEDIA_HEADERS)
+        self.wikipedia = WikipediaPageviews(
+            self.wikimedia_get,
+            store_dir=WIKIPEDIA_CONFIG['store_dir'],
+            window_days=WIKIPEDIA_CONFIG['window_days'],
+            timeout=HTTP_CONFIG['timeout'],
+            wikimedia_url=UPSTREAM_CONFIG['wikimedia_url'],
+            mediawiki_url=UPSTREAM_CONFIG['mediawiki_url'],
+            missing_title_ttl=WIKIPEDIA_CONFIG['missing_title_ttl'],
+            # Safe from nested waits: the GETs themselves run on the hedge pool
+            map_calls=self.map_calls
+        )
+
+        # The YouTube service is built once on first use; httplib2 connections
+        # are not thread-safe, so each worker thread gets its own
+        self.youtube = None
+        self.youtube_lock = threading.Lock()
+        self.youtube_http = threading.local()
+
+    def build_session(self, service: str) -> requests.Session:
+        """Create a requests session with a connection pool sized for the worker pool"""
+        session = requests.Session()
+        session.hooks['response'].append(
+            lambda response, *args, **kwargs: self.instrumentation.record_bytes(service, len(response.content))
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_CONFIG['pool_connections'],
+            pool_maxsize=HTTP_CONFIG['pool_maxsize']
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_youtube_client(self):
+        """Get the YouTube service, parsing the discovery document only once"""
+        if self.youtube is None:
+            with self.youtube_lock:
+                if self.youtube is None:
+                    from googleapiclient.discovery import build
+
+                    self.youtube = build(
+                        'youtube', 'v3',
+                        developerKey=API_KEYS['youtube']['api_key'],
+                        cache_discovery=False,
+                        client_options={'api_endpoint': UPSTREAM_CONFIG['youtube_url']}
+                    )
+        return self.youtube
+
+    def get_youtube_http(self) -> CountingHttp:
+        """Get this thread's persistent connection for YouTube requests"""
+        http = getattr(self.youtube_http, 'http', None)
+        if http is None:
+            import httplib2
+
+            http = CountingHttp(
+                httplib2.Http(timeout=HTTP_CONFIG['timeout']),
+                lambda size: self.instrumentation.record_bytes('youtube', size)
             )
-            logger.debug("Reddit API initialized successfully")
+            self.youtube_http.http = http
+        return http
+
+    def warm_up(self):
+        """Build API clients and open upstream connections ahead of the first request"""
+        try:
+            if API_KEYS['youtube']['api_key']:
+                self.get_youtube_client()
+            self.session.head(f"{UPSTREAM_CONFIG['wikimedia_url']}/", timeout=HTTP_CONFIG['timeout'])
+            logger.debug("Upstream clients warmed up")
         except Exception as e:
-            logger.error(f"Error initializing Reddit API: {str(e)}")
-            self.reddit = None
+            logger.warning(f"Error warming up upstream clients: {str(e)}")
+
+    def source_timeout(self, service: str, priority: str) -> float:
+        """Get the seconds a source call may take, including queueing for rate limit tokens"""
+        if priority == PRIORITY_INTERACTIVE:
+            return CONCURRENCY_CONFIG['source_timeouts'][service]
+        # Batch and background calls queue behind interactive ones for as long as a batch may run
+        return CONCURRENCY_CONFIG['batch_timeout']
+
+    def call_upstream(self, service: str, fn, priority: str = PRIORITY_INTERACTIVE, cost: float = 1):
+        """Call a service through its circuit breaker, retrying transient errors with jitter"""
+        # Retrying or queueing for tokens past the source deadline would only hold a worker
+        deadline = time.monotonic() + self.source_timeout(service, priority)
+
+        def attempt():
+            if not self.rate_limiter.acquire(service, priority, cost,
+                                             timeout=max(0.0, deadline - time.monotonic())):
+                raise RateLimitedError(f"{service} rate limit exhausted until after the deadline")
+            return fn()
+
+        return call_with_retries(
+            self.breakers[service],
+            attempt,
+            max_retries=RESILIENCE_CONFIG['max_retries'],
+            base_delay=RESILIENCE_CONFIG['retry_base_delay'],
+            max_delay=RESILIENCE_CONFIG['retry_max_delay'],
+            deadline=deadline
+        )
+
+    def wikimedia_get(self, url: str, priority: str, **kwargs) -> requests.Response:
+        """GET from Wikimedia through the breaker; raises for HTTP errors"""
+        return self.call_upstream('wikipedia', lambda: self.hedged_get(url, **kwargs), priority)
+
+    def hedged_get(self, url: str, **kwargs) -> requests.Response:
+        """GET a URL, sending a second request if the first is slower than hedge_after"""
+        self.wikimedia_requests += 1
+        first = self.hedge_executor.submit(self.session.get, url, **kwargs)
+        try:
+            response = first.result(timeout=RESILIENCE_CONFIG['hedge_after'])
+        except FuturesTimeout:
+            # Hedges are capped by share and take a rate limit token only if one is free
+            if (self.wikimedia_hedges >= RESILIENCE_CONFIG['hedge_max_share'] * self.wikimedia_requests
+                    or not self.rate_limiter.acquire('wikipedia', PRIORITY_BACKGROUND, timeout=0)):
+                response = first.result()
+            else:
+                self.wikimedia_hedges += 1
+                logger.debug(f"Hedging slow Wikimedia request: {url}")
+                second = self.hedge_executor.submit(self.session.get, url, **kwargs)
+                pending = {first, second}
+                while True:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    winner = next((f for f in done if f.exception() is None), None)
+                    if winner is not None or not pending:
+                        # Raises the first request's error if both failed
+                        response = (winner or first).result()
+                        break
+        response.raise_for_status()
+        return response
+
+    def initialize_executor(self):
+        """Create the thread pools used to fan out source fetches"""
+        self.executor = ThreadPoolExecutor(
+            max_workers=CONCURRENCY_CONFIG['max_workers'],
+            thread_name_prefix='metrics-source'
+        )
+        # Both FIFO, so a 151-Pokemon batch or leaderboard cycle would
+        # otherwise hold up every interactive fetch queued behind it
+        self.background_executor = ThreadPoolExecutor(
+            max_workers=CONCURRENCY_CONFIG['background_workers'],
+            thread_name_prefix='metrics-background'
+        )
+        # Async requests hold no thread while they wait, so many more are in
+        # flight than the source pool could serve before their deadlines
+        self.async_executor = ThreadPoolExecutor(
+            max_workers=CONCURRENCY_CONFIG['async_workers'],
+            thread_name_prefix='metrics-async'
+        )
+        # Kept apart from the source pool, whose workers these tasks wait on
+        self.refresh_executor = ThreadPoolExecutor(
+            max_workers=CONCURRENCY_CONFIG['refresh_workers'],
+            thread_name_prefix='metrics-refresh'
+        )
+        # Runs the per-Pokemon calls a batch job waits on; kept apart from
+        # the source pool for the same reason
+        self.batch_executor = ThreadPoolExecutor(
+            max_workers=CONCURRENCY_CONFIG['batch_workers'],
+            thread_name_prefix='metrics-batch'
+        )
+        # Runs the individual Wikimedia GETs so a slow one can be hedged
+        self.hedge_executor = ThreadPoolExecutor(
+            max_workers=HTTP_CONFIG['pool_maxsize'],
+            thread_name_prefix='metrics-hedge'
+        )
+
+    def initialize_history(self):
+        """Open the score history store, if enabled"""
+        self.history = None
+        if HISTORY_CONFIG['enabled']:
+            self.history = ScoreHistory(
+                HISTORY_CONFIG['db_path'],
+                batch_size=HISTORY_CONFIG['batch_size'],
+                flush_interval=HISTORY_CONFIG['flush_interval'],
+                queue_size=HISTORY_CONFIG['queue_size']
+            )
+
+    def initialize_reddit(self):
+        """Prepare the Reddit aggregate; the API client is created on first use"""
+        self.reddit = None
+        self.reddit_lock = threading.Lock()
+        self.reddit_aggregator = RedditAggregator(
+            self.fetch_reddit_page,
+            store_path=REDDIT_CONFIG['store_path'],
+            window_days=REDDIT_CONFIG['window_days'],
+            scan_interval=REDDIT_CONFIG['scan_interval'],
+            rescan_hours=REDDIT_CONFIG['rescan_hours'],
+            max_pages=REDDIT_CONFIG['max_pages'],
+            submit=self.refresh_executor.submit
+        )
+
+    def get_reddit_client(self):
+        """Get the Reddit API client, creating it on first use; None if that fails"""
+        if self.reddit is None:
+            with self.reddit_lock:
+                if self.reddit is None:
+                    try:
+                        import praw
+
+                        self.reddit = praw.Reddit(
+                            client_id=API_KEYS['reddit']['client_id'],
+                            client_secret=API_KEYS['reddit']['client_secret'],
+                            user_agent=API_KEYS['reddit']['user_agent'],
+                            read_only=True,
+                            reddit_url=UPSTREAM_CONFIG['reddit_url'],
+                            oauth_url=UPSTREAM_CONFIG['reddit_oauth_url'],
+                            # PRAW sets its own User-Agent, so it gets a separate pool
+                            requestor_kwargs={'session': self.build_session('reddit')}
+                        )
+                        logger.debug("Reddit API initialized successfully")
+                    except Exception as e:
+                        logger.error(f"Error initializing Reddit API: {str(e)}")
+        return self.reddit
 
     def initialize_twitter(self):
         """Initialize Twitter API client"""
         try:
+            import tweepy
+
             auth = tweepy.OAuthHandler(
                 API_KEYS['twitter']['api_key'],
                 API_KEYS['twitter']['api_secret']
@@ -74,163 +425,189 @@ class PokemonMetricsCollector:
             logger.error(f"Twitter initialization error: {str(e)}")
             self.twitter = None
 
-    def get_cached_trends(self, pokemon: str) -> dict:
+    def get_cached_trends(self, pokemon: str) -> Optional[TrendSeries]:
         """Get cached Google Trends data if available"""
-        cache_file = f'cache/trends_{pokemon.lower()}.json'
-        if os.path.exists(cache_file):
-            # Check if cache is less than 24 hours old
-            if time.time() - os.path.getmtime(cache_file) < 86400:  # 24 hours
-                try:
-                    with open(cache_file, 'r') as f:
-                        return json.load(f)
-                except Exception as e:
-                    logger.error(f"Error reading cache: {str(e)}")
-        return None
+        return self.cache.get(TRENDS_NAMESPACE, pokemon)
 
     def save_to_cache(self, pokemon: str, data: dict):
-        """Save Google Trends data to cache"""
-        cache_file = f'cache/trends_{pokemon.lower()}.json'
-        try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
-        except Exception as e:
-            logger.error(f"Error saving to cache: {str(e)}")
-
-    def get_google_trends(self, pokemon: str) -> dict:
-        """Get Google Trends data using fallback system"""
-        # Try to get cached data first
-        cached_data = self.get_cached_trends(pokemon)
-        if cached_data:
-            logger.debug(f"Using cached trends data for {pokemon}")
-            return cached_data
-
-        # Use fallback data
-        fallback_data = self.get_fallback_trends(pokemon)
-        
-        # Save fallback data to cache
-        self.save_to_cache(pokemon, fallback_data)
-        
-        return fallback_data
+        """Save Google Trends data (a result with trend_values) to cache"""
+        self.cache.set(TRENDS_NAMESPACE, pokemon, TrendSeries.from_dict(data))
+
+    def fetch_source(self, source: str, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> dict:
+        """Get a source's metrics through the shared result cache"""
+        namespace = CACHE_NAMESPACES.get(source)
+        if self.use_cache and namespace:
+            cached_data = self.cache.get(namespace, pokemon)
+            if cached_data is not None:
+                logger.debug(f"Using cached {source} data for {pokemon}")
+                return cached_data
+
+        breaker = self.breakers.get(source)
+        if breaker is not None and breaker.is_open():
+            # Fail fast while the service is down
+            self.instrumentation.count(source, OUTCOME_REJECTED)
+            return self.get_stale_result(source, pokemon) or self.get_empty_metrics(
+                source, error=f'{source} unavailable (circuit open)'
+            )
+
+        start = time.perf_counter()
+        result = self.sources[source](pokemon, priority=priority)
+        self.instrumentation.observe(
+            source,
+            time.perf_counter() - start,
+            OUTCOME_SUCCESS if result.get('success') else OUTCOME_ERROR
+        )
+
+        # Only successful results are cached so failures are retried
+        if self.use_cache and namespace and result.get('success'):
+            self.cache.set(namespace, pokemon, result)
+        elif not result.get('success') and breaker is not None:
+            return self.get_stale_result(source, pokemon) or result
+        return result
+
+    def get_stale_result(self, source: str, pokemon: str) -> Optional[dict]:
+        """Get an expired cached result to serve while a source is failing"""
+        if not self.use_cache:
+            return None
+        entry = self.cache.get_entry(CACHE_NAMESPACES[source], pokemon, max_stale=CACHE_CONFIG['stale_grace'])
+        if entry is None:
+            return None
+        logger.debug(f"Serving stale {source} data for {pokemon}")
+        return dict(entry[0], stale=True)
+
+    def fetch_source_batch(self, source: str, pokemon_list: List[str],
+                           priority: str = PRIORITY_BATCH) -> Dict[str, dict]:
+        """Get a source's metrics for several Pokemon, batching the cache misses"""
+        if source not in self.batch_sources:
+            return {pokemon: self.fetch_source(source, pokemon, priority) for pokemon in pokemon_list}
+
+        namespace = CACHE_NAMESPACES.get(source)
+        results = {}
+        missing = []
+        for pokemon in pokemon_list:
+            cached_data = self.cache.get(namespace, pokemon) if self.use_cache and namespace else None
+            if cached_data is not None:
+                results[pokemon] = cached_data
+            else:
+                missing.append(pokemon)
+
+        breaker = self.breakers.get(source)
+        if missing and breaker is not None and breaker.is_open():
+            self.instrumentation.count(f'{source}_batch', OUTCOME_REJECTED)
+            for pokemon in missing:
+                results[pokemon] = self.get_stale_result(source, pokemon) or self.get_empty_metrics(
+                    source, error=f'{source} unavailable (circuit open)'
+                )
+            return results
+
+        if missing:
+            start = time.perf_counter()
+            fetched = self.batch_sources[source](missing, priority=priority)
+            self.instrumentation.observe(
+                f'{source}_batch',
+                time.perf_counter() - start,
+                OUTCOME_SUCCESS if all(r.get('success') for r in fetched.values()) else OUTCOME_ERROR
+            )
+            for pokemon, result in fetched.items():
+                if self.use_cache and namespace and result.get('success'):
+                    self.cache.set(namespace, pokemon, result)
+                elif not result.get('success') and breaker is not None:
+                    fetched[pokemon] = self.get_stale_result(source, pokemon) or result
+            results.update(fetched)
+        return results
+
+    def get_google_trends(self, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> dict:
+        """Get Google Trends data from the ingested trends cache, or the fallback system"""
+        return self.get_google_trends_batch([pokemon], priority)[pokemon]
+
+    def get_google_trends_batch(self, pokemon_list: List[str],
+                                priority: str = PRIORITY_BATCH) -> Dict[str, dict]:
+        """Get Google Trends data for several Pokemon from the ingested trends cache, or the fallback system"""
+        return {pokemon: series.summary() for pokemon, series in self.get_trend_series_batch(pokemon_list).items()}
+
+    def get_trend_series_batch(self, pokemon_list: List[str]) -> Dict[str, TrendSeries]:
+        """Get trend series written by fetch_pytrends.py, generating fallback series for the misses"""
+        from trends_fallback import get_fallback_trends_batch
+
+        series = {}
+        missing = []
+        for pokemon in pokemon_list:
+            cached = self.get_cached_trends(pokemon) if self.use_cache else None
+            if cached is not None:
+                series[pokemon] = cached
+            else:
+                missing.append(pokemon)
+
+        # Fallbacks are cheap and not cached, so ingested series are served as soon as they land
+        for pokemon, data in get_fallback_trends_batch(missing).items():
+            series[pokemon] = TrendSeries.from_dict(data)
+        return series
+
+    def with_trend_series(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Get a copy of a score result with the raw weekly trend values included"""
+        if 'google_trends' not in result['metrics']:
+            return result
+        series = self.get_trend_series_batch([result['pokemon']])[result['pokemon']]
+        metrics = dict(result['metrics'])
+        metrics['google_trends'] = dict(metrics['google_trends'], trend_values=series.values.tolist())
+        return dict(result, metrics=metrics)
+
+    def chart_data(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the compact payload the web page renders from a score result"""
+        data = {
+            'pokemon': result['pokemon'],
+            'total_score': result['total_score'],
+            'using_fallback_trends': result['using_fallback_trends'],
+            'timed_out_sources': result['timed_out_sources'],
+            'metrics': {
+                source: {field: result['metrics'][source].get(field, 0) for field in fields}
+                for source, fields in CHART_FIELDS.items() if source in result['metrics']
+            }
+        }
+        if 'google_trends' in result['metrics']:
+            series = self.get_trend_series_batch([result['pokemon']])[result['pokemon']]
+            # Float32 noise would triple the size of the largest field
+            data['trend_values'] = [round(value, CHART_CONFIG['trend_decimals']) for value in series.values]
+        return data
 
     def get_fallback_trends(self, pokemon: str) -> dict:
         """Get fallback trends data based on Pokemon tiers"""
-        # Define popularity tiers for Gen 1 Pokemon
-        high_tier = {
-            'pikachu', 'charizard', 'mewtwo', 'mew', 'dragonite', 
-            'gyarados', 'gengar', 'snorlax'
-        }
-        mid_tier = {
-            'bulbasaur', 'squirtle', 'eevee', 'arcanine', 'alakazam',
-            'blastoise', 'venusaur', 'lapras', 'raichu', 'machamp'
-        }
-        low_tier = {
-            'rattata', 'pidgey', 'weedle', 'caterpie', 'metapod',
-            'kakuna', 'magikarp', 'zubat', 'ekans', 'spearow'
-        }
-        
-        # Generate synthetic trend data based on tiers
-        if pokemon.lower() in high_tier:
-            base_value = random.uniform(70, 100)
-            variance = 15
-        elif pokemon.lower() in mid_tier:
-            base_value = random.uniform(40, 70)
-            variance = 10
-        elif pokemon.lower() in low_tier:
-            base_value = random.uniform(5, 20)
-            variance = 5
-        else:
-            base_value = random.uniform(20, 40)
-            variance = 8
-        
-        # Generate 260 weekly data points (5 years) with seasonal variations
-        trend_values = []
-        for i in range(260):
-            # Add seasonal variation (higher in summer and winter)
-            seasonal = 10 * math.sin(2 * math.pi * i / 52)  # 52 weeks per year
-            # Add random variation
-            random_variation = random.uniform(-variance, variance)
-            # Calculate final value with constraints
-            value = max(0, min(100, base_value + seasonal + random_variation))
-            trend_values.append(value)
-        
-        return {
-            'trend_values': trend_values,
-            'max_value': max(trend_values),
-            'avg_value': sum(trend_values) / len(trend_values),
-            'success': True,
-            'is_fallback': True
-        }
+        from trends_fallback import get_fallback_trends
+
+        return get_fallback_trends(pokemon)
     
-    def get_wikipedia_views(self, pokemon: str) -> dict:
+    def get_wikipedia_views(self, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> dict:
         """Get Wikipedia page views with proper headers"""
-        headers = {
-            'User-Agent': 'PokemonPopularityApp/1.0 (https://github.com/yourusername/pokemon-popularity; your@email.com)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate'
-        }
-        
-        try:
-            # Format pokemon name for Wikipedia
-            wiki_pokemon = pokemon.capitalize()
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
-            
-            url = f"https://wikimedia.org/api/rest_v1/metrics/pageviews/per-article/en.wikipedia/all-access/all-agents/{wiki_pokemon}/monthly/{start_date.strftime('%Y%m%d')}00/{end_date.strftime('%Y%m%d')}00"
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'items' in data:
-                views = [item['views'] for item in data['items']]
-                return {
-                    'total_views': int(sum(views)),
-                    'monthly_avg': float(sum(views) / len(views)) if views else 0.0,
-                    'success': True
-                }
-        except Exception as e:
-            logger.error(f"Wikipedia API error: {str(e)}")
-        
-        return {
-            'total_views': 0,
-            'monthly_avg': 0.0,
-            'success': False
-        }
+        return self.get_wikipedia_views_batch([pokemon], priority)[pokemon]
+
+    def get_wikipedia_views_batch(self, pokemon_list: List[str],
+                                  priority: str = PRIORITY_BATCH) -> Dict[str, dict]:
+        """Get Wikipedia page views for several Pokemon, resolving titles in one query"""
+        return self.wikipedia.get_views(pokemon_list, priority)
     
-    def get_reddit_metrics(self, pokemon: str) -> dict:
+    def get_reddit_metrics(self, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> dict:
         """Get Reddit metrics for a Pokemon"""
-        if not self.reddit:
+        if not self.get_reddit_client():
             logger.warning("Reddit API not initialized")
-            return {
-                'total_posts': 0,
-                'total_upvotes': 0,
-                'avg_upvotes': 0.0,
-                'success': False
-            }
-        
+            return self.get_empty_metrics('reddit')
+
         try:
-            # Search for posts about the Pokemon in the last year
-            subreddit = self.reddit.subreddit('pokemon+pokemongo+pokemontcg')
-            posts = list(subreddit.search(f'title:{pokemon}', time_filter='year', limit=100))
-            
-            total_posts = len(posts)
-            total_upvotes = sum(post.score for post in posts)
-            avg_upvotes = total_upvotes / total_posts if total_posts > 0 else 0
-            
-            return {
-                'total_posts': total_posts,
-                'total_upvotes': total_upvotes,
-                'avg_upvotes': avg_upvotes,
-                'success': True
-            }
+            # One scan of new posts updates the totals for every Pokemon
+            self.reddit_aggregator.refresh(priority)
         except Exception as e:
             logger.error(f"Error fetching Reddit metrics: {str(e)}")
-            return {
-                'total_posts': 0,
-                'total_upvotes': 0,
-                'avg_upvotes': 0.0,
-                'success': False
-            }
+            if not self.reddit_aggregator.ready:
+                return self.get_empty_metrics('reddit', error=str(e))
+        return self.reddit_aggregator.metrics(pokemon)
+
+    def fetch_reddit_page(self, after: Optional[str], priority: str) -> List[Post]:
+        """Get one page of the newest posts across the Pokemon subreddits"""
+        subreddit = self.get_reddit_client().subreddit(REDDIT_CONFIG['subreddits'])
+        params = {'after': after} if after else {}
+        submissions = self.call_upstream(
+            'reddit', lambda: list(subreddit.new(limit=100, params=params)), priority
+        )
+        return [(post.fullname, post.title, post.score, post.created_utc) for post in submissions]
 
     def get_twitter_metrics(self, pokemon: str) -> dict:
         """Get Twitter metrics for the Pokemon"""
@@ -279,115 +656,410 @@ class PokemonMetricsCollector:
                 'success': False
             }
 
-    def get_youtube_metrics(self, pokemon: str) -> dict:
+    def get_youtube_metrics(self, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> dict:
         """Get YouTube metrics for a Pokemon"""
-        try:
-            if not API_KEYS['youtube']['api_key'] or API_KEYS['youtube']['api_key'] == 'YOUR_YOUTUBE_API_KEY':
-                logger.error("YouTube API key not configured")
-                return {
-                    'total_videos': 0,
-                    'total_views': 0,
-                    'total_likes': 0,
-                    'avg_views': 0,
-                    'success': False,
-                    'error': 'API key not configured'
-                }
-
-            youtube = build('youtube', 'v3', developerKey=API_KEYS['youtube']['api_key'])
-            
-            # Search for videos about the Pokemon
-            logger.debug(f"Searching YouTube for: pokemon {pokemon}")
-            search_response = youtube.search().list(
-                q=f'pokemon {pokemon}',
-                part='id,snippet',
-                maxResults=50,
-                type='video',
-                order='relevance',
-                regionCode='US',
-                relevanceLanguage='en'
-            ).execute()
-            
-            video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
-            
-            if not video_ids:
-                logger.warning(f"No YouTube videos found for {pokemon}")
-                return {
-                    'total_videos': 0,
-                    'total_views': 0,
-                    'total_likes': 0,
-                    'avg_views': 0,
-                    'success': True,  # This is still a valid response
-                    'message': 'No videos found'
-                }
-            
-            logger.debug(f"Found {len(video_ids)} videos, fetching statistics")
-            # Get video statistics
-            videos_response = youtube.videos().list(
-                part='statistics',
-                id=','.join(video_ids)
-            ).execute()
-            
-            total_views = 0
-            total_likes = 0
-            for video in videos_response.get('items', []):
-                stats = video.get('statistics', {})
-                try:
-                    total_views += int(stats.get('viewCount', 0))
-                    total_likes += int(stats.get('likeCount', 0))
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Error parsing video statistics: {e}")
-                    continue
-            
-            total_videos = len(video_ids)
-            avg_views = total_views / total_videos if total_videos > 0 else 0
-            
-            logger.debug(f"Successfully retrieved YouTube metrics for {pokemon}")
+        return self.get_youtube_metrics_batch([pokemon], priority)[pokemon]
+
+    def has_youtube_ids(self, pokemon: str) -> bool:
+        """Check whether a Pokemon's video ids are cached, so scoring it needs no search"""
+        return self.use_cache and self.cache.get(YOUTUBE_IDS_NAMESPACE, pokemon) is not None
+
+    def get_youtube_metrics_batch(self, pokemon_list: List[str],
+                                  priority: str = PRIORITY_BATCH) -> Dict[str, dict]:
+        """Get YouTube metrics for several Pokemon, packing statistics lookups into 50-id calls"""
+        if not API_KEYS['youtube']['api_key'] or API_KEYS['youtube']['api_key'] == 'YOUR_YOUTUBE_API_KEY':
+            logger.error("YouTube API key not configured")
             return {
-                'total_videos': total_videos,
-                'total_views': total_views,
-                'total_likes': total_likes,
-                'avg_views': avg_views,
-                'success': True
+                pokemon: self.get_empty_metrics('youtube', error='API key not configured')
+                for pokemon in pokemon_list
             }
+
+        try:
+            youtube = self.get_youtube_client()
         except Exception as e:
             logger.error(f"Error fetching YouTube metrics: {str(e)}")
+            return {
+                pokemon: self.get_empty_metrics('youtube', error=str(e))
+                for pokemon in pokemon_list
+            }
+
+        results = {}
+        video_ids = {}
+        uncached = []
+        for pokemon in pokemon_list:
+            # Searches cost 100 units each, so the ids are cached far longer than the counts
+            cached_ids = self.cache.get(YOUTUBE_IDS_NAMESPACE, pokemon) if self.use_cache else None
+            if cached_ids is not None:
+                video_ids[pokemon] = cached_ids
+            else:
+                uncached.append(pokemon)
+
+        def search(pokemon):
+            try:
+                return self.search_youtube_videos(youtube, pokemon, priority), None
+            except Exception as e:
+                logger.error(f"Error fetching YouTube metrics: {str(e)}")
+                return None, str(e)
+
+        for pokemon, (ids, error) in zip(uncached, self.map_calls(search, uncached)):
+            if error is not None:
+                results[pokemon] = self.get_empty_metrics('youtube', error=error)
+                continue
+            video_ids[pokemon] = ids
+            if self.use_cache:
+                self.cache.set(YOUTUBE_IDS_NAMESPACE, pokemon, ids)
+
+        # Look up statistics for every distinct video, 50 ids per call
+        all_ids = list(dict.fromkeys(i for ids in video_ids.values() for i in ids))
+        chunks = [all_ids[start:start + YOUTUBE_IDS_PER_CALL]
+                  for start in range(0, len(all_ids), YOUTUBE_IDS_PER_CALL)]
+
+        def lookup(chunk):
+            logger.debug(f"Fetching statistics for {len(chunk)} videos")
+            try:
+                return self.get_youtube_video_statistics(youtube, chunk, priority), None
+            except Exception as e:
+                logger.error(f"Error fetching YouTube metrics: {str(e)}")
+                return {}, str(e)
+
+        statistics = {}
+        failed_ids = {}
+        for chunk, (chunk_statistics, error) in zip(chunks, self.map_calls(lookup, chunks)):
+            statistics.update(chunk_statistics)
+            if error is not None:
+                failed_ids.update((video_id, error) for video_id in chunk)
+
+        for pokemon, ids in video_ids.items():
+            errors = [failed_ids[i] for i in ids if i in failed_ids]
+            if errors:
+                results[pokemon] = self.get_empty_metrics('youtube', error=errors[0])
+            else:
+                results[pokemon] = self.summarize_youtube_videos(pokemon, ids, statistics)
+        return results
+
+    def map_calls(self, fn, items: list) -> list:
+        """Apply fn to every item concurrently on the batch pool; a single item runs inline"""
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        return list(self.batch_executor.map(fn, items))
+
+    def search_youtube_videos(self, youtube, pokemon: str, priority: str) -> List[str]:
+        """Get the ids of the most relevant videos about a Pokemon"""
+        logger.debug(f"Searching YouTube for: pokemon {pokemon}")
+        request = youtube.search().list(
+            q=f'pokemon {pokemon}',
+            part='id,snippet',
+            maxResults=50,
+            type='video',
+            order='relevance',
+            regionCode='US',
+            relevanceLanguage='en'
+        )
+        search_response = self.call_upstream(
+            'youtube', lambda: request.execute(http=self.get_youtube_http()), priority, YOUTUBE_SEARCH_COST
+        )
+        
+        return [item['id']['videoId'] for item in search_response.get('items', [])]
+
+    def get_youtube_video_statistics(self, youtube, video_ids: List[str],
+                                     priority: str) -> Dict[str, Tuple[int, int]]:
+        """Get (views, likes) for up to 50 videos in one call"""
+        request = youtube.videos().list(
+            part='statistics',
+            id=','.join(video_ids)
+        )
+        videos_response = self.call_upstream(
+            'youtube', lambda: request.execute(http=self.get_youtube_http()), priority, YOUTUBE_VIDEOS_COST
+        )
+        
+        statistics = {}
+        for video in videos_response.get('items', []):
+            stats = video.get('statistics', {})
+            try:
+                statistics[video['id']] = (
+                    int(stats.get('viewCount', 0)),
+                    int(stats.get('likeCount', 0))
+                )
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Error parsing video statistics: {e}")
+                continue
+        return statistics
+
+    def summarize_youtube_videos(self, pokemon: str, video_ids: List[str],
+                                 statistics: Dict[str, Tuple[int, int]]) -> dict:
+        """Aggregate video statistics into a Pokemon's YouTube metrics"""
+        if not video_ids:
+            logger.warning(f"No YouTube videos found for {pokemon}")
             return {
                 'total_videos': 0,
                 'total_views': 0,
                 'total_likes': 0,
                 'avg_views': 0,
-                'success': False,
-                'error': str(e)
+                'success': True,  # This is still a valid response
+                'message': 'No videos found'
             }
 
-    def calculate_popularity_score(self, pokemon: str) -> Dict[str, Any]:
-        """Calculate overall popularity score with fallback handling"""
-        metrics = {
-            'google_trends': self.get_google_trends(pokemon),
-            'wikipedia': self.get_wikipedia_views(pokemon),
-            'reddit': self.get_reddit_metrics(pokemon),
-            'youtube': self.get_youtube_metrics(pokemon)
-        }
+        total_views = 0
+        total_likes = 0
+        total_videos = 0
+        for video_id in video_ids:
+            # Cached ids may include videos that have since been removed
+            if video_id not in statistics:
+                continue
+            views, likes = statistics[video_id]
+            total_views += views
+            total_likes += likes
+            total_videos += 1
         
-        # Use weights from config
-        weights = METRIC_WEIGHTS.copy()
+        avg_views = total_views / total_videos if total_videos > 0 else 0
+        
+        logger.debug(f"Successfully retrieved YouTube metrics for {pokemon}")
+        return {
+            'total_videos': total_videos,
+            'total_views': total_views,
+            'total_likes': total_likes,
+            'avg_views': avg_views,
+            'success': True
+        }
+
+    def get_empty_metrics(self, source: str, **extra) -> dict:
+        """Get a fresh zeroed result for a source, with optional extra flags"""
+        result = copy.deepcopy(EMPTY_METRICS[source])
+        result.update(extra)
+        return result
+
+    def collect_metrics(self, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> Tuple[Dict[str, dict], List[str]]:
+        """Fetch every source one after another"""
+        metrics = {name: self.fetch_source(name, pokemon, priority) for name in self.sources}
+        return metrics, []
+
+    def source_executor(self, priority: str) -> ThreadPoolExecutor:
+        """Get the pool for source jobs at a priority"""
+        return self.executor if priority == PRIORITY_INTERACTIVE else self.background_executor
+
+    def collect_metrics_concurrently(self, pokemon: str,
+                                     priority: str = PRIORITY_INTERACTIVE) -> Tuple[Dict[str, dict], List[str]]:
+        """Fetch every source in parallel, giving each its own deadline"""
+        start = time.monotonic()
+        executor = self.source_executor(priority)
+        futures = {
+            name: executor.submit(self.fetch_source, name, pokemon, priority)
+            for name in self.sources
+        }
+
+        metrics = {}
+        timed_out = []
+        for name, future in futures.items():
+            # Deadlines are measured from submission, so the total wait is
+            # bounded by the slowest deadline rather than their sum
+            remaining = start + self.source_timeout(name, priority) - time.monotonic()
+            try:
+                metrics[name] = future.result(timeout=max(0, remaining))
+            except FuturesTimeout:
+                future.cancel()
+                logger.warning(f"{name} missed its deadline for {pokemon}")
+                metrics[name] = self.get_empty_metrics(name, timed_out=True)
+                timed_out.append(name)
+                self.instrumentation.count(name, OUTCOME_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Error fetching {name} metrics: {str(e)}")
+                metrics[name] = self.get_empty_metrics(name, error=str(e))
+        return metrics, timed_out
+
+    def get_popularity_score(self, pokemon: str, priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Get the popularity score, serving a stale result while it refreshes in the background"""
+        cached = self.get_cached_score(pokemon)
+        if cached is not None:
+            return cached
+        return self.calculate_popularity_score(pokemon, priority=priority)
+
+    async def get_popularity_score_async(self, pokemon: str,
+                                         priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Get the popularity score from an event loop, serving stale results while refreshing"""
+        cached = self.get_cached_score(pokemon)
+        if cached is not None:
+            return cached
+        return await self.calculate_popularity_score_async(pokemon, priority)
+
+    def get_cached_score(self, pokemon: str) -> Optional[Dict[str, Any]]:
+        """Get a cached score; past its TTL it is flagged stale and a refresh is started"""
+        if not self.use_cache:
+            return None
+
+        entry = self.cache.get_entry(SCORE_NAMESPACE, pokemon, max_stale=CACHE_CONFIG['stale_grace'])
+        if entry is None:
+            return None
+
+        result, age = entry
+        if age < self.cache.ttl_for(SCORE_NAMESPACE):
+            return result
+
+        self.refresh_in_background(pokemon)
+        return dict(result, stale=True, age_seconds=round(age, 1))
+
+    def refresh_in_background(self, pokemon: str):
+        """Recompute a score off the request path unless that is already happening"""
+        if self.single_flight.in_flight(pokemon.lower()):
+            return
+        logger.debug(f"Refreshing stale score for {pokemon} in the background")
+        self.refresh_executor.submit(
+            self.calculate_popularity_score, pokemon, None, PRIORITY_BACKGROUND
+        )
+
+    def calculate_popularity_score(self, pokemon: str, concurrent: bool = None,
+                                   priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Calculate overall popularity score, sharing work with identical in-flight calls"""
+        start = time.perf_counter()
+        try:
+            result, shared = self.single_flight.do(
+                pokemon.lower(),
+                lambda: self.compute_popularity_score(pokemon, concurrent, priority)
+            )
+        except Exception:
+            self.instrumentation.observe('popularity_score', time.perf_counter() - start, OUTCOME_ERROR)
+            raise
+        self.instrumentation.observe('popularity_score', time.perf_counter() - start)
+        if shared:
+            logger.debug(f"Coalesced request for {pokemon} onto in-flight computation")
+        return result
+
+    def compute_popularity_score(self, pokemon: str, concurrent: bool = None,
+                                 priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Calculate overall popularity score with fallback handling"""
+        if concurrent is None:
+            concurrent = CONCURRENCY_CONFIG['enabled']
+
+        if concurrent:
+            metrics, timed_out = self.collect_metrics_concurrently(pokemon, priority)
+        else:
+            metrics, timed_out = self.collect_metrics(pokemon, priority)
+
+        return self.build_score(pokemon, metrics, timed_out)
+
+    async def calculate_popularity_score_async(self, pokemon: str,
+                                               priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Calculate overall popularity score from an event loop, sharing identical in-flight calls"""
+        start = time.perf_counter()
+        try:
+            result, shared = await self.async_single_flight.do(
+                pokemon.lower(),
+                lambda: self.compute_popularity_score_async(pokemon, priority)
+            )
+        except Exception:
+            self.instrumentation.observe('popularity_score', time.perf_counter() - start, OUTCOME_ERROR)
+            raise
+        self.instrumentation.observe('popularity_score', time.perf_counter() - start)
+        if shared:
+            logger.debug(f"Coalesced request for {pokemon} onto in-flight computation")
+        return result
+
+    async def compute_popularity_score_async(self, pokemon: str,
+                                             priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Fan sources out to the thread pool and await them without holding a thread"""
+        timeouts = CONCURRENCY_CONFIG['source_timeouts']
+        timed_out = []
+
+        async def fetch(name):
+            future = self.async_executor.submit(self.fetch_source, name, pokemon, priority)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeouts.get(name, 10))
+            except asyncio.TimeoutError:
+                logger.warning(f"{name} missed its deadline for {pokemon}")
+                timed_out.append(name)
+                self.instrumentation.count(name, OUTCOME_TIMEOUT)
+                return self.get_empty_metrics(name, timed_out=True)
+            except Exception as e:
+                logger.error(f"Error fetching {name} metrics: {str(e)}")
+                return self.get_empty_metrics(name, error=str(e))
+
+        names = list(self.sources)
+        results = await asyncio.gather(*(fetch(name) for name in names))
+        return self.build_score(pokemon, dict(zip(names, results)), timed_out)
+
+    def calculate_popularity_scores(self, pokemon_list: List[str],
+                                    priority: str = PRIORITY_BATCH) -> Iterator[Dict[str, Any]]:
+        """Score several Pokemon, yielding each result as soon as all its sources finish"""
+        pokemon_list = list(dict.fromkeys(pokemon_list))
+        pending = {pokemon: {} for pokemon in pokemon_list}
+
+        # Batch-capable sources get one job per chunk, so results stream as
+        # chunks finish; the rest get one job per Pokemon
+        chunk_size = CONCURRENCY_CONFIG['batch_chunk_size']
+        executor = self.source_executor(priority)
+        futures = {}
+        for name in self.sources:
+            if name in self.batch_sources:
+                groups = [pokemon_list[i:i + chunk_size] for i in range(0, len(pokemon_list), chunk_size)]
+            else:
+                groups = [[pokemon] for pokemon in pokemon_list]
+            for group in groups:
+                future = executor.submit(self.fetch_source_batch, name, group, priority)
+                futures[future] = (name, group)
+
+        try:
+            for future in as_completed(futures, timeout=CONCURRENCY_CONFIG['batch_timeout']):
+                name, group = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {name} metrics: {str(e)}")
+                    results = {pokemon: self.get_empty_metrics(name, error=str(e)) for pokemon in group}
+
+                for pokemon in group:
+                    pending[pokemon][name] = results.get(pokemon) or self.get_empty_metrics(name)
+                    if len(pending[pokemon]) == len(self.sources):
+                        yield self.build_score(pokemon, pending.pop(pokemon), [])
+        except FuturesTimeout:
+            logger.warning(f"Batch deadline reached with {len(pending)} Pokemon outstanding")
+
+        # Anything left over missed the batch deadline
+        for future in futures:
+            future.cancel()
+        for pokemon, metrics in pending.items():
+            timed_out = [name for name in self.sources if name not in metrics]
+            for name in timed_out:
+                metrics[name] = self.get_empty_metrics(name, timed_out=True)
+                self.instrumentation.count(name, OUTCOME_TIMEOUT)
+            yield self.build_score(pokemon, metrics, timed_out)
+
+    def build_score(self, pokemon: str, metrics: Dict[str, dict], timed_out: List[str]) -> Dict[str, Any]:
+        """Combine per-source metrics into the weighted popularity score"""
+        # Use weights from config, dropping disabled sources and ones that never answered.
+        # Synthetic fallback trends are not on the ingested series' scale (peak 100
+        # across every Pokemon), so they are shown but not scored
+        weights = {k: w for k, w in METRIC_WEIGHTS.items()
+                   if k in metrics and k not in timed_out and not metrics[k].get('is_fallback')}
         
         # Calculate normalized scores
         score_components = {
-            'google_trends': metrics['google_trends']['avg_value'] / 100,
-            'wikipedia': min(metrics['wikipedia']['monthly_avg'] / NORMALIZATION['wikipedia_views'], 1),
-            'reddit': min(metrics['reddit']['avg_upvotes'] / NORMALIZATION['reddit_upvotes'], 1),
-            'youtube': min(metrics['youtube']['avg_views'] / NORMALIZATION['youtube_views'], 1)
+            name: normalize(metrics[name])
+            for name, normalize in SCORE_NORMALIZERS.items() if name in metrics
         }
         
-        # Calculate final score
+        # Calculate final score, re-weighted over the sources that answered
+        total_weight = sum(weights.values())
         total_score = sum(weights[k] * score_components[k] for k in weights.keys())
+        if total_weight:
+            total_score /= total_weight
         
-        return {
+        result = {
             'pokemon': pokemon,
             'timestamp': datetime.now().isoformat(),
             'total_score': float(total_score),
             'score_components': score_components,
             'metrics': metrics,
-            'using_fallback_trends': metrics['google_trends'].get('is_fallback', False)
-        } 
\ No newline at end of file
+            'using_fallback_trends': metrics.get('google_trends', {}).get('is_fallback', False),
+            'timed_out_sources': timed_out
+        }
+
+        # Partial results, with a source that timed out, failed or answered from
+        # stale data, are neither cached nor recorded, so the next request retries them
+        if is_degraded(result):
+            return result
+        if self.use_cache:
+            self.cache.set(SCORE_NAMESPACE, pokemon, result)
+
+        # Written by a background thread, so this adds no request latency
+        if self.history:
+            self.history.record(result)
+        return result
\ No newline at end of file
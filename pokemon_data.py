@@ -1,3 +1,6 @@
+import json
+import re
+
 # List of all Pokemon names (Gen 1)
 VALID_POKEMON = {
     "bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard",
@@ -28,6 +31,98 @@ VALID_POKEMON = {
     "mew"
 }
 
+# Spellings that don't reduce to a canonical name on their own
+EXTRA_ALIASES = {
+    "nidoranfemale": "nidoran♀",
+    "nidoranmale": "nidoran♂",
+}
+
+# Most suggestions returned for a prefix
+MAX_SUGGESTIONS = 10
+
+# Words in post titles; keeps the punctuation inside names like "farfetch'd"
+TITLE_WORD_PATTERN = re.compile(r"[a-z0-9♀♂.'’]+")
+
+# A possessive ending, as in "pikachu's"; apostrophes elsewhere belong to names like "farfetch'd"
+POSSESSIVE_PATTERN = re.compile(r"['’]s$")
+
+def normalize_name(name):
+    """Reduce a name to lowercase letters and digits, spelling out gender symbols"""
+    name = name.strip().lower().replace("♀", "f").replace("♂", "m")
+    return re.sub(r"[^a-z0-9]", "", name)
+
+def build_alias_index():
+    """Map every normalized spelling to its canonical Pokemon name"""
+    index = {normalize_name(p): p for p in VALID_POKEMON}
+    index.update(EXTRA_ALIASES)
+    return index
+
+def build_prefix_index(alias_index):
+    """Map every prefix of every normalized spelling to matching canonical names"""
+    matches = {}
+    for alias, canonical in alias_index.items():
+        for i in range(1, len(alias) + 1):
+            matches.setdefault(alias[:i], set()).add(canonical)
+    return {prefix: sorted(names)[:MAX_SUGGESTIONS] for prefix, names in matches.items()}
+
+# Built once at import so lookups are a single dict access
+ALIAS_INDEX = build_alias_index()
+PREFIX_INDEX = build_prefix_index(ALIAS_INDEX)
+
+def canonicalize_pokemon(name):
+    """Get the canonical Pokemon name for any accepted spelling, or None"""
+    return ALIAS_INDEX.get(normalize_name(name))
+
 def is_valid_pokemon(name):
     """Check if the given name is a valid Pokemon name (case-insensitive)"""
-    return name.lower() in {p.lower() for p in VALID_POKEMON} 
\ No newline at end of file
+    return canonicalize_pokemon(name) is not None
+
+def suggest_pokemon(query, limit=MAX_SUGGESTIONS):
+    """Get canonical Pokemon names starting with the query"""
+    prefix = normalize_name(query)
+    if not prefix:
+        return []
+    return PREFIX_INDEX.get(prefix, [])[:limit]
+
+def find_pokemon(text):
+    """Get the canonical names of every Pokemon mentioned in free text"""
+    words = [POSSESSIVE_PATTERN.sub('', word) for word in TITLE_WORD_PATTERN.findall(text.lower())]
+    found = set()
+    for i in range(len(words)):
+        # Two-word spellings like "mr. mime" and "nidoran f" need a word pair
+        for phrase in (words[i], " ".join(words[i:i + 2])):
+            canonical = ALIAS_INDEX.get(normalize_name(phrase))
+            if canonical:
+                found.add(canonical)
+    return found
+
+JS_TEMPLATE = """// Generated by `python pokemon_data.py` from pokemon_data.py - do not edit by hand
+// Suggestions come from the /suggest endpoint, so the prefix index is not shipped
+const VALID_POKEMON = new Set({valid});
+
+// Normalized spelling -> canonical name
+const POKEMON_ALIASES = {aliases};
+
+function normalizePokemonName(name) {{
+    return name.trim().toLowerCase().replace(/♀/g, 'f').replace(/♂/g, 'm').replace(/[^a-z0-9]/g, '');
+}}
+
+function canonicalizePokemon(name) {{
+    return POKEMON_ALIASES[normalizePokemonName(name)] || null;
+}}
+
+function isValidPokemon(name) {{
+    return canonicalizePokemon(name) !== null;
+}}
+"""
+
+def export_js(path="static/pokemon_data.js"):
+    """Write the name indexes to the frontend's pokemon_data.js"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(JS_TEMPLATE.format(
+            valid=json.dumps(sorted(VALID_POKEMON), ensure_ascii=False),
+            aliases=json.dumps(ALIAS_INDEX, ensure_ascii=False, sort_keys=True)
+        ))
+
+if __name__ == "__main__":
+    export_js()
@@ -0,0 +1,135 @@
+"""
+Token-bucket rate limiting for upstream APIs
+Work over budget is queued rather than failed, and queued work is served
+by priority so interactive requests go ahead of batch and background jobs
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BATCH = 'batch'
+PRIORITY_BACKGROUND = 'background'
+
+PRIORITIES = {
+    PRIORITY_INTERACTIVE: 0,
+    PRIORITY_BATCH: 1,
+    PRIORITY_BACKGROUND: 2
+}
+
+# Window length in seconds for each RATE_LIMITS key
+LIMIT_PERIODS = {
+    'requests_per_second': 1,
+    'requests_per_minute': 60,
+    'requests_per_100seconds': 100,
+    'requests_per_day': 86400,
+    'units_per_day': 86400
+}
+
+# Quota buckets are charged each call's cost; request buckets one token per call
+UNIT_LIMITS = frozenset({'units_per_day'})
+
+
+class RateLimitedError(Exception):
+    """Raised instead of calling a service whose rate limit tokens would not arrive in time"""
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, period: float):
+        """Create a full bucket that refills capacity tokens every period seconds"""
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        """Add the tokens earned since the last refill"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """Get the seconds until cost tokens are available"""
+        self.refill(now)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class _Service:
+    def __init__(self, buckets: Dict[str, TokenBucket]):
+        self.buckets = buckets
+        self.condition = threading.Condition()
+        self.queue = []  # Heap of (priority rank, sequence) tickets
+
+
+class RateLimitScheduler:
+    def __init__(self, limits: Dict[str, Dict[str, int]], shares: int = 1):
+        """Create one set of token buckets per service from a RATE_LIMITS-style dict
+
+        shares splits every limit evenly, for processes that each run
+        their own scheduler against the same upstream quotas.
+        """
+        self.services = {
+            service: _Service({
+                key: TokenBucket(limit / shares, LIMIT_PERIODS[key])
+                for key, limit in service_limits.items()
+                if key in LIMIT_PERIODS
+            })
+            for service, service_limits in limits.items()
+        }
+        self.sequence = itertools.count()
+
+    def acquire(self, service: str, priority: str = PRIORITY_INTERACTIVE,
+                cost: float = 1, timeout: Optional[float] = None) -> bool:
+        """Take a token from each request bucket and cost units from each quota bucket, queueing until available"""
+        state = self.services.get(service)
+        if state is None:
+            return True  # No declared limits for this service
+        charges = {key: cost if key in UNIT_LIMITS else 1 for key in state.buckets}
+        if any(charges[key] > bucket.capacity for key, bucket in state.buckets.items()):
+            raise ValueError(f"Cost {cost} exceeds a {service} bucket capacity")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with state.condition:
+            ticket = (PRIORITIES[priority], next(self.sequence))
+            heapq.heappush(state.queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    # Only the highest-priority, longest-waiting ticket may take tokens
+                    if state.queue[0] is ticket:
+                        wait = max(
+                            (b.wait_time(charges[key], now) for key, b in state.buckets.items()),
+                            default=0.0
+                        )
+                        if wait <= 0:
+                            for key, bucket in state.buckets.items():
+                                bucket.tokens -= charges[key]
+                            return True
+                    if deadline is not None:
+                        remaining = deadline - now
+                        # Give up now rather than sleep to a deadline the tokens cannot meet
+                        if remaining <= 0 or (wait is not None and wait > remaining):
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    state.condition.wait(wait)
+            finally:
+                state.queue.remove(ticket)
+                heapq.heapify(state.queue)
+                state.condition.notify_all()
+
+    def remaining(self) -> Dict[str, Dict[str, float]]:
+        """Get the tokens left in every bucket plus the queue depth per service"""
+        budget = {}
+        now = time.monotonic()
+        for service, state in self.services.items():
+            with state.condition:
+                for bucket in state.buckets.values():
+                    bucket.refill(now)
+                budget[service] = {key: bucket.tokens for key, bucket in state.buckets.items()}
+                budget[service]['queued'] = len(state.queue)
+        return budget
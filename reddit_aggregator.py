@@ -0,0 +1,189 @@
+"""
+Rolling-window Reddit aggregates for every Pokemon
+One scan of the subreddits' newest posts covers every Pokemon at once:
+titles are matched against the name index and per-Pokemon post and
+upvote totals are updated incrementally, so scoring never searches live
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pokemon_data import find_pokemon
+from rate_limiter import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+# (fullname, title, score, created_utc) for one post
+Post = Tuple[str, str, int, float]
+
+
+class RedditAggregator:
+    def __init__(self, fetch_page: Callable[[Optional[str], str], List[Post]], store_path: str,
+                 window_days: int, scan_interval: float, rescan_hours: float, max_pages: int,
+                 submit: Callable[..., Any]):
+        """Create an aggregator; fetch_page(after, priority) returns one page of newest posts"""
+        self.fetch_page = fetch_page
+        self.submit = submit  # submit(fn, *args) runs fn off the request path, like Executor.submit
+        self.store_path = store_path
+        self.window = window_days * 86400
+        self.scan_interval = scan_interval
+        self.rescan = rescan_hours * 3600
+        self.max_pages = max_pages
+        self.lock = threading.Lock()       # Guards the aggregates
+        self.scan_lock = threading.Lock()  # Only one scan at a time
+        self.posts: Dict[str, Tuple[float, int, Tuple[str, ...]]] = {}  # fullname -> (created, score, pokemon)
+        self.expiry: List[Tuple[float, str]] = []  # Heap of (created, fullname)
+        self.totals: Dict[str, List[int]] = {}  # pokemon -> [posts, upvotes]
+        self.last_scan = 0.0
+        self.scan_queued = False
+        self.load()
+
+    @property
+    def ready(self) -> bool:
+        """Check whether at least one scan's worth of posts is available"""
+        return self.last_scan > 0
+
+    def load(self):
+        """Restore posts saved by a previous process"""
+        try:
+            with open(self.store_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error reading {self.store_path}: {str(e)}")
+            return
+
+        with self.lock:
+            for fullname, (created, score, pokemon) in data['posts'].items():
+                self.add(fullname, created, score, tuple(pokemon))
+            self.last_scan = data['last_scan']
+        logger.debug(f"Loaded {len(self.posts)} Reddit posts from {self.store_path}")
+
+    def save(self):
+        """Write the posts in the window atomically"""
+        with self.lock:
+            data = {
+                'last_scan': self.last_scan,
+                'posts': {fullname: list(post) for fullname, post in self.posts.items()}
+            }
+        directory = os.path.dirname(self.store_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # Unique per writer, so concurrent saves never share a half-written file
+        temp_path = f'{self.store_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.store_path)
+        except Exception as e:
+            logger.error(f"Error writing {self.store_path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def add(self, fullname: str, created: float, score: int, pokemon: Tuple[str, ...]):
+        """Add a post or update its score, adjusting totals by the difference (caller holds the lock)"""
+        previous = self.posts.get(fullname)
+        if previous is None:
+            heapq.heappush(self.expiry, (created, fullname))
+            delta_posts, delta_score = 1, score
+        else:
+            delta_posts, delta_score = 0, score - previous[1]
+        self.posts[fullname] = (created, score, pokemon)
+        for name in pokemon:
+            totals = self.totals.setdefault(name, [0, 0])
+            totals[0] += delta_posts
+            totals[1] += delta_score
+
+    def expire(self, now: float):
+        """Drop posts that have left the window (caller holds the lock)"""
+        cutoff = now - self.window
+        while self.expiry and self.expiry[0][0] < cutoff:
+            _, fullname = heapq.heappop(self.expiry)
+            _, score, pokemon = self.posts.pop(fullname)
+            for name in pokemon:
+                totals = self.totals[name]
+                totals[0] -= 1
+                totals[1] -= score
+                if totals[0] <= 0:
+                    del self.totals[name]
+
+    def scan(self, priority: str) -> int:
+        """Read new posts back to the last scan (less the rescan period); returns pages fetched"""
+        now = time.time()
+        horizon = max(now - self.window, self.last_scan - self.rescan if self.ready else 0)
+        after = None
+        pages = 0
+        while pages < self.max_pages:
+            page = self.fetch_page(after, priority)
+            pages += 1
+            with self.lock:
+                for fullname, title, score, created in page:
+                    if created < now - self.window:
+                        continue
+                    pokemon = tuple(sorted(find_pokemon(title)))
+                    if pokemon:
+                        self.add(fullname, created, score, pokemon)
+            if not page or page[-1][3] < horizon:
+                break
+            after = page[-1][0]
+
+        with self.lock:
+            self.expire(now)
+            self.last_scan = now
+        self.save()
+        logger.debug(f"Scanned {pages} pages of Reddit posts; {len(self.posts)} in window")
+        return pages
+
+    def refresh(self, priority: str):
+        """Scan if the last scan is older than scan_interval; waits only when there is no data yet"""
+        if time.time() - self.last_scan < self.scan_interval:
+            return
+        if not self.ready:
+            self.scan_if_due(priority)
+            return
+        # Later scans run in the background while requests serve the current totals
+        with self.lock:
+            if self.scan_queued:
+                return
+            self.scan_queued = True
+        try:
+            self.submit(self.background_scan)
+        except Exception:
+            with self.lock:
+                self.scan_queued = False
+            raise
+
+    def background_scan(self):
+        """Scan on behalf of refresh, logging rather than raising errors"""
+        try:
+            self.scan_if_due(PRIORITY_BACKGROUND)
+        except Exception as e:
+            logger.error(f"Error scanning Reddit posts: {str(e)}")
+        finally:
+            with self.lock:
+                self.scan_queued = False
+
+    def scan_if_due(self, priority: str):
+        """Scan unless another thread already is or the last scan is recent"""
+        with self.scan_lock:
+            if time.time() - self.last_scan >= self.scan_interval:
+                self.scan(priority)
+
+    def metrics(self, pokemon: str) -> dict:
+        """Get a Pokemon's Reddit metrics from the rolling totals"""
+        with self.lock:
+            total_posts, total_upvotes = self.totals.get(pokemon, (0, 0))
+        return {
+            'total_posts': total_posts,
+            'total_upvotes': total_upvotes,
+            'avg_upvotes': total_upvotes / total_posts if total_posts > 0 else 0.0,
+            'success': True
+        }
@@ -0,0 +1,92 @@
+"""
+Single-flight request coalescing
+Concurrent calls for the same key share one in-flight computation
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        """Create an empty single-flight group"""
+        self.lock = threading.Lock()
+        self.calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn for key unless a call is already in flight; returns (result, shared)"""
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self.calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a computation for key is currently running"""
+        with self.lock:
+            return key in self.calls
+
+    def stats(self) -> Dict[str, int]:
+        """Get the coalesced request count and the number of in-flight keys"""
+        with self.lock:
+            return {
+                'coalesced_requests': self.coalesced,
+                'in_flight': len(self.calls)
+            }
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """Create an empty single-flight group for use on one event loop"""
+        self.calls: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await fn() for key unless a call is already in flight; returns (result, shared)"""
+        task = self.calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self.calls[key] = task
+        task.add_done_callback(lambda _: self.calls.pop(key, None))
+        # Shielded so a disconnecting leader doesn't cancel work others wait on
+        return await asyncio.shield(task), False
+
+    def stats(self) -> Dict[str, int]:
+        """Get the coalesced request count and the number of in-flight keys"""
+        return {
+            'coalesced_requests': self.coalesced,
+            'in_flight': len(self.calls)
+        }
@@ -0,0 +1,108 @@
+"""
+Startup-time benchmark for the web app
+Imports app.py (which builds the collector) in fresh interpreters and
+reports the wall time, and checks that no heavy client library was
+imported before any source needed it
+
+    python startup_benchmark.py --runs 5 --max-seconds 1.0
+
+Results are written as JSON (benchmark_results/<commit>-startup.json by
+default); the exit status is non-zero when startup is over --max-seconds
+or a heavy module was loaded, so the script can guard against regressions.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmark import RESULTS_DIR, git_commit
+
+# Libraries that must only be imported on first use of their source
+HEAVY_MODULES = ('pytrends', 'pandas', 'numpy', 'praw', 'prawcore',
+                 'googleapiclient', 'httplib2', 'tweepy', 'bs4')
+
+# Run in the child: import the app with state in a scratch directory, report loaded heavy modules
+PROBE = """
+import json, os, sys
+import config
+work_dir = sys.argv[1]
+config.CACHE_CONFIG['cache_dir'] = os.path.join(work_dir, 'cache')
+config.HISTORY_CONFIG['db_path'] = os.path.join(work_dir, 'history.sqlite3')
+config.WIKIPEDIA_CONFIG['store_dir'] = os.path.join(work_dir, 'wikipedia')
+config.REDDIT_CONFIG['store_path'] = os.path.join(work_dir, 'reddit_posts.json')
+config.LEADERBOARD_CONFIG['enabled'] = False
+config.LEADERBOARD_CONFIG['store_path'] = os.path.join(work_dir, 'leaderboard.json')
+import app
+heavy = json.loads(sys.argv[2])
+print(json.dumps(sorted(name for name in heavy if name in sys.modules)))
+"""
+
+
+def measure_once(work_dir: str) -> dict:
+    """Import the app in a new interpreter; returns its wall time and loaded heavy modules"""
+    start = time.perf_counter()
+    output = subprocess.check_output(
+        [sys.executable, '-c', PROBE, work_dir, json.dumps(HEAVY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'heavy_modules': json.loads(output.decode().strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Interpreters to start')
+    parser.add_argument('--max-seconds', type=float, help='Fail if the median startup is slower')
+    parser.add_argument('--output', help='Result file (default benchmark_results/<commit>-startup.json)')
+    args = parser.parse_args(argv)
+
+    runs = []
+    for _ in range(args.runs):
+        # A fresh directory each time, so no run starts from another's cache
+        work_dir = tempfile.mkdtemp(prefix='pokemon-startup-')
+        try:
+            runs.append(measure_once(work_dir))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    seconds = sorted(run['seconds'] for run in runs)
+    heavy = sorted({name for run in runs for name in run['heavy_modules']})
+    result = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'parameters': vars(args),
+        'startup_seconds': {
+            'median': statistics.median(seconds),
+            'min': seconds[0],
+            'max': seconds[-1]
+        },
+        'heavy_modules_loaded': heavy
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}-startup.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    print(json.dumps({key: result[key] for key in ('startup_seconds', 'heavy_modules_loaded')}, indent=2))
+    print(f'Results written to {output}')
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if args.max_seconds is not None and result['startup_seconds']['median'] > args.max_seconds:
+        failures.append(f"median startup {result['startup_seconds']['median']:.3f}s exceeds {args.max_seconds}s")
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
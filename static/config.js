@@ -1,12 +0,0 @@
-const CONFIG = {
-    API_KEYS: {
-        'reddit': {
-            'client_id': 'YOUR_REDDIT_CLIENT_ID',
-            'client_secret': 'YOUR_REDDIT_CLIENT_SECRET',
-            'user_agent': 'PokemonPopularityApp/1.0'
-        },
-        'youtube': {
-            'api_key': 'YOUR_YOUTUBE_API_KEY'
-        }
-    }
-}; 
\ No newline at end of file
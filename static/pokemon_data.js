@@ -1,8 +1,18 @@
-const VALID_POKEMON = new Set([
-    "bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard",
-    // ... (copy all Pokemon names from pokemon_data.py)
-]);
-
-function is_valid_pokemon(name) {
-    return VALID_POKEMON.has(name.toLowerCase());
-} 
\ No newline at end of file
+// Generated by `python pokemon_data.py` from pokemon_data.py - do not edit by hand
+// Suggestions come from the /suggest endpoint, so the prefix index is not shipped
+const VALID_POKEMON = new Set(["abra", "aerodactyl", "alakazam", "arbok", "arcanine", "articuno", "beedrill", "bellsprout", "blastoise", "bulbasaur", "butterfree", "caterpie", "chansey", "charizard", "charmander", "charmeleon", "clefable", "clefairy", "cloyster", "cubone", "dewgong", "diglett", "ditto", "dodrio", "doduo", "dragonair", "dragonite", "dratini", "drowzee", "dugtrio", "eevee", "ekans", "electabuzz", "electrode", "exeggcute", "exeggutor", "farfetch'd", "fearow", "flareon", "gastly", "gengar", "geodude", "gloom", "golbat", "goldeen", "golduck", "golem", "graveler", "grimer", "growlithe", "gyarados", "haunter", "hitmonchan", "hitmonlee", "horsea", "hypno", "ivysaur", "jigglypuff", "jolteon", "jynx", "kabuto", "kabutops", "kadabra", "kakuna", "kangaskhan", "kingler", "koffing", "krabby", "lapras", "lickitung", "machamp", "machoke", "machop", "magikarp", "magmar", "magnemite", "magneton", "mankey", "marowak", "meowth", "metapod", "mew", "mewtwo", "moltres", "mr. mime", "muk", "nidoking", "nidoqueen", "nidoran♀", "nidoran♂", "nidorina", "nidorino", "ninetales", "oddish", "omanyte", "omastar", "onix", "paras", "parasect", "persian", "pidgeot", "pidgeotto", "pidgey", "pikachu", "pinsir", "poliwag", "poliwhirl", "poliwrath", "ponyta", "porygon", "primeape", "psyduck", "raichu", "rapidash", "raticate", "rattata", "rhydon", "rhyhorn", "sandshrew", "sandslash", "scyther", "seadra", "seaking", "seel", "shellder", "slowbro", "slowpoke", "snorlax", "spearow", "squirtle", "starmie", "staryu", "tangela", "tauros", "tentacool", "tentacruel", "vaporeon", "venomoth", "venonat", "venusaur", "victreebel", "vileplume", "voltorb", "vulpix", "wartortle", "weedle", "weepinbell", "weezing", "wigglytuff", "zapdos", "zubat"]);
+
+// Normalized spelling -> canonical name
+const POKEMON_ALIASES = {"abra": "abra", "aerodactyl": "aerodactyl", "alakazam": "alakazam", "arbok": "arbok", "arcanine": "arcanine", "articuno": "articuno", "beedrill": "beedrill", "bellsprout": "bellsprout", "blastoise": "blastoise", "bulbasaur": "bulbasaur", "butterfree": "butterfree", "caterpie": "caterpie", "chansey": "chansey", "charizard": "charizard", "charmander": "charmander", "charmeleon": "charmeleon", "clefable": "clefable", "clefairy": "clefairy", "cloyster": "cloyster", "cubone": "cubone", "dewgong": "dewgong", "diglett": "diglett", "ditto": "ditto", "dodrio": "dodrio", "doduo": "doduo", "dragonair": "dragonair", "dragonite": "dragonite", "dratini": "dratini", "drowzee": "drowzee", "dugtrio": "dugtrio", "eevee": "eevee", "ekans": "ekans", "electabuzz": "electabuzz", "electrode": "electrode", "exeggcute": "exeggcute", "exeggutor": "exeggutor", "farfetchd": "farfetch'd", "fearow": "fearow", "flareon": "flareon", "gastly": "gastly", "gengar": "gengar", "geodude": "geodude", "gloom": "gloom", "golbat": "golbat", "goldeen": "goldeen", "golduck": "golduck", "golem": "golem", "graveler": "graveler", "grimer": "grimer", "growlithe": "growlithe", "gyarados": "gyarados", "haunter": "haunter", "hitmonchan": "hitmonchan", "hitmonlee": "hitmonlee", "horsea": "horsea", "hypno": "hypno", "ivysaur": "ivysaur", "jigglypuff": "jigglypuff", "jolteon": "jolteon", "jynx": "jynx", "kabuto": "kabuto", "kabutops": "kabutops", "kadabra": "kadabra", "kakuna": "kakuna", "kangaskhan": "kangaskhan", "kingler": "kingler", "koffing": "koffing", "krabby": "krabby", "lapras": "lapras", "lickitung": "lickitung", "machamp": "machamp", "machoke": "machoke", "machop": "machop", "magikarp": "magikarp", "magmar": "magmar", "magnemite": "magnemite", "magneton": "magneton", "mankey": "mankey", "marowak": "marowak", "meowth": "meowth", "metapod": "metapod", "mew": "mew", "mewtwo": "mewtwo", "moltres": "moltres", "mrmime": "mr. mime", "muk": "muk", "nidoking": "nidoking", "nidoqueen": "nidoqueen", "nidoranf": "nidoran♀", "nidoranfemale": "nidoran♀", "nidoranm": "nidoran♂", "nidoranmale": "nidoran♂", "nidorina": "nidorina", "nidorino": "nidorino", "ninetales": "ninetales", "oddish": "oddish", "omanyte": "omanyte", "omastar": "omastar", "onix": "onix", "paras": "paras", "parasect": "parasect", "persian": "persian", "pidgeot": "pidgeot", "pidgeotto": "pidgeotto", "pidgey": "pidgey", "pikachu": "pikachu", "pinsir": "pinsir", "poliwag": "poliwag", "poliwhirl": "poliwhirl", "poliwrath": "poliwrath", "ponyta": "ponyta", "porygon": "porygon", "primeape": "primeape", "psyduck": "psyduck", "raichu": "raichu", "rapidash": "rapidash", "raticate": "raticate", "rattata": "rattata", "rhydon": "rhydon", "rhyhorn": "rhyhorn", "sandshrew": "sandshrew", "sandslash": "sandslash", "scyther": "scyther", "seadra": "seadra", "seaking": "seaking", "seel": "seel", "shellder": "shellder", "slowbro": "slowbro", "slowpoke": "slowpoke", "snorlax": "snorlax", "spearow": "spearow", "squirtle": "squirtle", "starmie": "starmie", "staryu": "staryu", "tangela": "tangela", "tauros": "tauros", "tentacool": "tentacool", "tentacruel": "tentacruel", "vaporeon": "vaporeon", "venomoth": "venomoth", "venonat": "venonat", "venusaur": "venusaur", "victreebel": "victreebel", "vileplume": "vileplume", "voltorb": "voltorb", "vulpix": "vulpix", "wartortle": "wartortle", "weedle": "weedle", "weepinbell": "weepinbell", "weezing": "weezing", "wigglytuff": "wigglytuff", "zapdos": "zapdos", "zubat": "zubat"};
+
+function normalizePokemonName(name) {
+    return name.trim().toLowerCase().replace(/♀/g, 'f').replace(/♂/g, 'm').replace(/[^a-z0-9]/g, '');
+}
+
+function canonicalizePokemon(name) {
+    return POKEMON_ALIASES[normalizePokemonName(name)] || null;
+}
+
+function isValidPokemon(name) {
+    return canonicalizePokemon(name) !== null;
+}
@@ -1,21 +1,13 @@
 let trendsChart = null;  // Global variable to store the chart instance
 
-// Add these functions at the beginning of your script.js
-async function fetchWikipediaViews(pokemon) {
-    const response = await fetch(`https://wikimedia.org/api/rest_v1/metrics/pageviews/per-article/en.wikipedia/all-access/all-agents/${pokemon}/monthly/2023010100/2023123100`);
-    const data = await response.json();
-    return data;
-}
-
-async function fetchRedditMetrics(pokemon) {
-    const response = await fetch(`https://www.reddit.com/search.json?q=${pokemon}&limit=100`);
-    const data = await response.json();
-    return data;
-}
-
-async function fetchYoutubeMetrics(pokemon) {
-    const response = await fetch(`https://www.googleapis.com/youtube/v3/search?part=snippet&q=${pokemon}&key=${CONFIG.API_KEYS.youtube.api_key}&maxResults=50`);
+// Everything the page shows comes from /chart, which the server caches and
+// browsers revalidate by ETag; the page never calls the upstream APIs itself
+async function fetchChartData(pokemon) {
+    const response = await fetch(`chart?pokemon=${encodeURIComponent(pokemon)}`);
     const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || 'Error fetching data.');
+    }
     return data;
 }
 
@@ -59,7 +51,9 @@ async function getMetrics() {
         return;
     }
 
-    if (!is_valid_pokemon(pokemon)) {
+    // The canonical name keeps every spelling on one cached /chart URL
+    const canonical = canonicalizePokemon(pokemon);
+    if (!canonical) {
         document.getElementById('result').innerHTML = '<p class="error">Please enter a valid Pokémon name</p>';
         return;
     }
@@ -67,15 +61,8 @@ async function getMetrics() {
     showLoader();
 
     try {
-        const [wikiData, redditData, youtubeData] = await Promise.all([
-            fetchWikipediaViews(pokemon),
-            fetchRedditMetrics(pokemon),
-            fetchYoutubeMetrics(pokemon)
-        ]);
-
-        // Process the data and create metrics object
-        const metrics = processMetrics(pokemon, wikiData, redditData, youtubeData);
-        displayMetrics(metrics);
+        const data = await fetchChartData(canonical);
+        displayMetrics(data);
     } catch (error) {
         console.error('Error:', error);
         document.getElementById('result').innerHTML = '<p class="error">Error fetching data.</p>';
@@ -96,12 +83,13 @@ function displayMetrics(data) {
                     <div class="score-circle">${(data.total_score * 100).toFixed(1)}</div>
                 </div>
                 <div class="metrics-grid">
+                    ${data.metrics.google_trends ? `
                     <div class="metric-card trends-card">
                         <h4>Google Trends</h4>
                         <canvas id="trendsChart"></canvas>
                         <p class="metric-value">Average Score: ${(data.metrics.google_trends.avg_value).toFixed(1)}</p>
-                    </div>
-                    
+                    </div>` : ''}
+                    ${data.metrics.wikipedia ? `
                     <div class="metric-card">
                         <h4>Wikipedia Views</h4>
                         <p>
@@ -112,8 +100,8 @@ function displayMetrics(data) {
                             <span class="metric-label">Total Views:</span><br>
                             <span class="metric-value">${Math.round(data.metrics.wikipedia.total_views).toLocaleString()}</span>
                         </p>
-                    </div>
-                    
+                    </div>` : ''}
+                    ${data.metrics.reddit ? `
                     <div class="metric-card">
                         <h4>Reddit Activity</h4>
                         <p>
@@ -128,8 +116,8 @@ function displayMetrics(data) {
                             <span class="metric-label">Average Upvotes:</span><br>
                             <span class="metric-value">${data.metrics.reddit.avg_upvotes.toFixed(1)}</span>
                         </p>
-                    </div>
-                    
+                    </div>` : ''}
+                    ${data.metrics.youtube ? `
                     <div class="metric-card">
                         <h4>YouTube Presence</h4>
                         <p><small>Based on the 50 most relevant videos</small></p>
@@ -149,7 +137,7 @@ function displayMetrics(data) {
                             <span class="metric-label">Total Likes:</span><br>
                             <span class="metric-value">${data.metrics.youtube.total_likes.toLocaleString()}</span>
                         </p>
-                    </div>
+                    </div>` : ''}
                 </div>
             </div>
         `;
@@ -159,14 +147,14 @@ function displayMetrics(data) {
             html = html.replace(
                 '<h4>Google Trends</h4>',
                 '<h4>Google Trends (Estimated)</h4>' +
-                '<p class="metric-label">Using estimated data due to API limitations</p>'
+                '<p class="metric-label">Estimated data, not counted in the score</p>'
             );
         }
         
         resultDiv.innerHTML = html;
         
-        if (data.metrics.google_trends.trend_values.length > 0) {
-            createTrendsChart(data.metrics.google_trends.trend_values, data.pokemon);
+        if (data.trend_values && data.trend_values.length > 0) {
+            createTrendsChart(data.trend_values, data.pokemon);
         }
     } catch (error) {
         console.error('Error displaying metrics:', error);
@@ -0,0 +1,66 @@
+import os
+import time
+
+from cache import TieredCache
+
+
+def make_cache(tmp_path, ttl=60, max_entries=10):
+    return TieredCache(cache_dir=str(tmp_path), ttls={'scores': ttl}, default_ttl=ttl,
+                       max_entries=max_entries)
+
+
+def age_file(cache, key, seconds):
+    """Backdate an entry's file, which the disk tier uses for its age"""
+    path = cache.cache_file('scores', key)
+    stored_at = time.time() - seconds
+    os.utime(path, (stored_at, stored_at))
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('scores', 'Pikachu', {'total_score': 0.5})
+    assert cache.get('scores', 'pikachu') == {'total_score': 0.5}
+
+    cache.memory.clear()
+    age_file(cache, 'pikachu', 61)
+    assert cache.get('scores', 'pikachu') is None
+
+
+def test_least_recently_used_entries_are_evicted_from_memory(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set('scores', 'pikachu', 1)
+    cache.set('scores', 'mew', 2)
+    cache.get('scores', 'pikachu')
+    cache.set('scores', 'eevee', 3)
+
+    assert list(cache.memory) == [('scores', 'pikachu'), ('scores', 'eevee')]
+    assert cache.stats()['namespaces']['scores']['evictions'] == 1
+    # Still on disk
+    assert cache.get('scores', 'mew') == 2
+
+
+def test_stale_entries_are_read_within_max_stale(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('scores', 'pikachu', 1)
+    cache.memory.clear()
+    age_file(cache, 'pikachu', 90)
+
+    assert cache.get_entry('scores', 'pikachu') is None
+    value, age = cache.get_entry('scores', 'pikachu', max_stale=60)
+    assert value == 1
+    assert 89 < age < 92
+    assert cache.stats()['namespaces']['scores']['stale_hits'] == 1
+    assert cache.get_entry('scores', 'pikachu', max_stale=20) is None
+
+
+def test_writes_leave_no_temp_files(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('scores', 'pikachu', 1)
+    cache.set('scores', 'pikachu', 2)
+    assert os.listdir(tmp_path) == ['scores_pikachu.json']
+
+
+def test_failed_writes_leave_no_temp_files(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('scores', 'pikachu', object())  # Not JSON serializable
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,127 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from circuit_breaker import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, CircuitOpenError, call_with_retries
+)
+from rate_limiter import RateLimitedError
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.response = SimpleNamespace(status_code=status)
+
+
+def failing(errors, result='ok'):
+    """Get a function that raises each error in turn, then returns result"""
+    calls = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+def call(breaker, fn, max_retries=2, deadline_in=5.0):
+    return call_with_retries(breaker, fn, max_retries=max_retries, base_delay=0.001,
+                             max_delay=0.01, deadline=time.monotonic() + deadline_in)
+
+
+def test_transient_errors_are_retried():
+    breaker = CircuitBreaker('svc', failure_threshold=5, reset_timeout=30)
+    fn, calls = failing([HTTPStatusError(503), ConnectionError()])
+    assert call(breaker, fn) == 'ok'
+    assert len(calls) == 3
+    assert breaker.snapshot()['consecutive_failures'] == 0
+
+
+def test_retries_stop_at_max_retries():
+    breaker = CircuitBreaker('svc', failure_threshold=5, reset_timeout=30)
+    fn, calls = failing([HTTPStatusError(429)] * 3)
+    with pytest.raises(HTTPStatusError):
+        call(breaker, fn, max_retries=1)
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried_or_counted():
+    breaker = CircuitBreaker('svc', failure_threshold=1, reset_timeout=30)
+    fn, calls = failing([HTTPStatusError(404)])
+    with pytest.raises(HTTPStatusError):
+        call(breaker, fn)
+    assert len(calls) == 1
+    assert breaker.snapshot()['state'] == STATE_CLOSED
+
+
+def test_quota_errors_open_the_breaker():
+    breaker = CircuitBreaker('svc', failure_threshold=1, reset_timeout=30)
+    fn, calls = failing([HTTPStatusError(403)])
+    with pytest.raises(HTTPStatusError):
+        call(breaker, fn)
+    assert len(calls) == 1
+    assert breaker.snapshot()['state'] == STATE_OPEN
+
+
+def test_no_retry_is_started_past_the_deadline():
+    breaker = CircuitBreaker('svc', failure_threshold=5, reset_timeout=30)
+    fn, calls = failing([HTTPStatusError(503)] * 3)
+    with pytest.raises(HTTPStatusError):
+        call(breaker, fn, deadline_in=0)
+    assert len(calls) == 1
+
+
+def test_open_breaker_fails_fast_then_allows_one_trial():
+    breaker = CircuitBreaker('svc', failure_threshold=2, reset_timeout=0.05)
+    fn, calls = failing([HTTPStatusError(500)] * 2)
+    # The breaker opens mid-retry, which ends the retries
+    with pytest.raises(CircuitOpenError):
+        call(breaker, fn, max_retries=5)
+    assert len(calls) == 2
+    assert breaker.snapshot()['state'] == STATE_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        call(breaker, fn)
+    assert len(calls) == 2
+
+    time.sleep(0.06)
+    assert call(breaker, fn) == 'ok'
+    assert breaker.snapshot()['state'] == STATE_CLOSED
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker('svc', failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    fn, _ = failing([HTTPStatusError(500)] * 3)
+    with pytest.raises(HTTPStatusError):
+        call(breaker, fn, max_retries=0)
+    assert breaker.snapshot()['state'] == STATE_OPEN
+    assert breaker.snapshot()['opens'] == 2
+
+
+def test_rate_limited_calls_are_not_retried_or_counted():
+    breaker = CircuitBreaker('svc', failure_threshold=1, reset_timeout=30)
+    fn, calls = failing([RateLimitedError('svc')])
+    with pytest.raises(RateLimitedError):
+        call(breaker, fn)
+    assert len(calls) == 1
+    assert breaker.snapshot()['state'] == STATE_CLOSED
+    assert breaker.snapshot()['consecutive_failures'] == 0
+
+
+def test_rate_limited_trial_releases_the_half_open_slot():
+    breaker = CircuitBreaker('svc', failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    fn, _ = failing([RateLimitedError('svc')])
+    with pytest.raises(RateLimitedError):
+        call(breaker, fn)
+
+    # Otherwise the breaker would wait forever for a trial that never ran
+    assert breaker.snapshot()['state'] == STATE_HALF_OPEN
+    assert not breaker.is_open()
+    assert call(breaker, fn) == 'ok'
@@ -0,0 +1,49 @@
+import pytest
+
+from fetch_pytrends import normalize_payloads, plan_payloads
+
+
+def test_plan_payloads_leads_every_payload_with_the_anchor():
+    plan = plan_payloads(['a', 'b', 'anchor', 'c', 'a', 'd', 'e'], 'anchor', 3)
+    assert plan == [['anchor', 'a', 'b'], ['anchor', 'c', 'd'], ['anchor', 'e']]
+
+
+def test_plan_payloads_with_only_the_anchor():
+    assert plan_payloads(['anchor'], 'anchor', 5) == [['anchor']]
+
+
+def test_plan_payloads_groups_by_popularity_with_unknowns_last():
+    popularity = {'a': 50, 'b': 1, 'c': 40, 'd': 2}
+    plan = plan_payloads(['a', 'b', 'c', 'd', 'new'], 'anchor', 3, popularity)
+    assert plan == [['anchor', 'b', 'd'], ['anchor', 'c', 'a'], ['anchor', 'new']]
+
+
+def test_normalize_payloads_rescales_by_the_anchor_then_to_peak_100():
+    payloads = [
+        {'anchor': [10, 10], 'big': [100, 50]},
+        # The anchor reads 50 here, so this payload is 5x finer than the first
+        {'anchor': [50, 50], 'small': [10, 5]},
+    ]
+    series = normalize_payloads(payloads, 'anchor')
+    assert series['big'] == [100, 50]
+    assert series['anchor'] == [10, 10]
+    assert series['small'] == [2, 1]
+
+
+def test_normalize_payloads_skips_payloads_without_anchor_data():
+    payloads = [{'anchor': [10, 10], 'a': [20, 20]}, {'anchor': [0, 0], 'b': [30, 30]}]
+    assert set(normalize_payloads(payloads, 'anchor')) == {'anchor', 'a'}
+
+
+def test_normalize_payloads_keeps_a_reference_scale():
+    # A subset run must land on the full run's scale, not re-peak to 100
+    payloads = [{'anchor': [100, 100], 'rattata': [20, 30]}]
+    series = normalize_payloads(payloads, 'anchor', reference=[10, 10])
+    assert series['anchor'] == [10, 10]
+    assert series['rattata'] == [2, 3]
+
+
+def test_normalize_payloads_compares_the_overlapping_weeks():
+    payloads = [{'anchor': [0, 10, 10], 'a': [0, 40, 40]}]
+    series = normalize_payloads(payloads, 'anchor', reference=[5, 5])
+    assert series['a'] == pytest.approx([0, 20, 20])
@@ -0,0 +1,37 @@
+from contextlib import closing
+
+import pytest
+
+from history import ScoreHistory
+
+
+def make_history(tmp_path, scores):
+    history = ScoreHistory(str(tmp_path / 'history.sqlite3'))
+    with closing(history.connect()) as connection, connection:
+        connection.executemany(
+            'INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [('pikachu', ts, score, score, None, None, None) for ts, score in scores]
+        )
+    return history
+
+
+def test_scores_are_averaged_into_buckets(tmp_path):
+    history = make_history(tmp_path, [(0, 0.2), (4, 0.4), (5, 0.6), (9, 0.8)])
+    points = history.query('pikachu', 0, 10, 2)
+
+    assert [point['samples'] for point in points] == [2, 2]
+    assert [point['total_score'] for point in points] == pytest.approx([0.3, 0.7])
+    assert points[1]['score_components']['google_trends'] == pytest.approx(0.7)
+    assert points[1]['score_components']['wikipedia'] is None
+
+
+def test_the_end_of_the_range_joins_the_last_bucket(tmp_path):
+    history = make_history(tmp_path, [(0, 0.2), (10, 0.8)])
+    assert [point['samples'] for point in history.query('pikachu', 0, 10, 2)] == [1, 1]
+    assert len(history.query('pikachu', 0, 10, 1)) == 1
+
+
+def test_scores_outside_the_range_or_for_other_pokemon_are_left_out(tmp_path):
+    history = make_history(tmp_path, [(-1, 0.2), (3, 0.4), (11, 0.8)])
+    assert [point['samples'] for point in history.query('pikachu', 0, 10, 5)] == [1]
+    assert history.query('mew', 0, 10, 5) == []
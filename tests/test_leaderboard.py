@@ -0,0 +1,86 @@
+import pytest
+
+from config import LEADERBOARD_CONFIG, RATE_LIMITS
+from leaderboard import Leaderboard
+from metrics_collector import YOUTUBE_SEARCH_COST, YOUTUBE_VIDEOS_COST
+
+NAMES = ['abra', 'bulbasaur', 'charmander', 'ditto']
+
+
+@pytest.fixture(autouse=True)
+def store_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'leaderboard.json')
+    monkeypatch.setitem(LEADERBOARD_CONFIG, 'store_path', path)
+    return path
+
+
+class FakeCollector:
+    def __init__(self, cached_ids):
+        self.sources = {'youtube': None}
+        self.cached_ids = set(cached_ids)
+
+    def has_youtube_ids(self, pokemon):
+        return pokemon in self.cached_ids
+
+    def calculate_popularity_scores(self, pokemon_list, priority):
+        for pokemon in pokemon_list:
+            yield {'pokemon': pokemon, 'total_score': len(pokemon), 'score_components': {}}
+
+
+def cycles_until_batch(leaderboard, limit=500):
+    for cycle in range(1, limit):
+        batch = leaderboard.next_batch()
+        if batch:
+            return cycle, batch
+    raise AssertionError('No batch within the limit')
+
+
+def test_cached_ids_cost_one_unit_per_score():
+    leaderboard = Leaderboard(FakeCollector(NAMES), NAMES)
+    units, _ = leaderboard.youtube_budget()
+    batch = leaderboard.next_batch()
+    assert len(batch) == min(int(units), LEADERBOARD_CONFIG['max_batch_size'], len(NAMES))
+
+
+def test_uncached_ids_wait_until_a_search_is_affordable():
+    leaderboard = Leaderboard(FakeCollector([]), NAMES)
+    units, _ = leaderboard.youtube_budget()
+    search = YOUTUBE_SEARCH_COST + YOUTUBE_VIDEOS_COST
+    assert units < search  # Otherwise this test checks nothing
+
+    cycle, batch = cycles_until_batch(leaderboard)
+    assert batch == ['abra']
+    assert cycle == pytest.approx(search / units, abs=1)
+    assert leaderboard.youtube_credit[0] < units
+
+
+def test_saved_budget_is_capped_at_one_search():
+    leaderboard = Leaderboard(FakeCollector(NAMES), NAMES)
+    leaderboard.youtube_credit = [10 ** 6, 10 ** 6]
+    leaderboard.next_batch()
+    assert leaderboard.youtube_credit[0] <= YOUTUBE_SEARCH_COST + YOUTUBE_VIDEOS_COST
+
+
+def test_units_per_day_bounds_a_day_of_cycles():
+    leaderboard = Leaderboard(FakeCollector(NAMES[:2]), NAMES)
+    spent = 0
+    cycles = 86400 // leaderboard.refresh_interval
+    for _ in range(cycles):
+        for pokemon in leaderboard.next_batch():
+            spent += leaderboard.youtube_cost(pokemon)[0]
+            leaderboard.collector.cached_ids.add(pokemon)
+    share = LEADERBOARD_CONFIG['rate_budget_share']
+    assert spent <= RATE_LIMITS['youtube']['units_per_day'] * share + YOUTUBE_SEARCH_COST
+
+
+def test_other_workers_read_the_saved_ranking():
+    refresher = Leaderboard(FakeCollector(NAMES), NAMES)
+    reader = Leaderboard(FakeCollector(NAMES), NAMES)
+    assert reader.top(10) == []
+
+    refresher.refresh_once()
+    top = reader.top(10)
+    assert [entry['pokemon'] for entry in top] == [entry['pokemon'] for entry in refresher.ranking]
+    assert top[0]['rank'] == 1
+    assert reader.last_refresh == refresher.last_refresh
+    assert set(reader.entries) == set(refresher.entries)
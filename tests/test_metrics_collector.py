@@ -0,0 +1,22 @@
+from metrics_collector import is_degraded
+
+
+def score(timed_out=(), stale=False, **metrics):
+    result = {'pokemon': 'pikachu', 'timed_out_sources': list(timed_out), 'metrics': metrics}
+    if stale:
+        result['stale'] = True
+    return result
+
+
+def test_complete_score_is_not_degraded():
+    assert not is_degraded(score(wikipedia={'success': True}, reddit={'success': True}))
+
+
+def test_failed_source_degrades_a_score():
+    assert is_degraded(score(wikipedia={'success': False, 'error': '503'}, reddit={'success': True}))
+
+
+def test_timed_out_or_stale_sources_degrade_a_score():
+    assert is_degraded(score(timed_out=['wikipedia'], wikipedia={'success': False}))
+    assert is_degraded(score(wikipedia={'success': True, 'stale': True}))
+    assert is_degraded(score(stale=True, wikipedia={'success': True}))
@@ -0,0 +1,10 @@
+from pokemon_data import find_pokemon
+
+
+def test_find_pokemon_matches_possessives():
+    assert find_pokemon("Pikachu's new card") == {'pikachu'}
+    assert find_pokemon("Mr. Mime’s hat") == {'mr. mime'}
+
+
+def test_find_pokemon_keeps_apostrophes_inside_names():
+    assert find_pokemon("Farfetch'd and Farfetch'd's leek") == {"farfetch'd"}
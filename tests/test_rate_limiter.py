@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimitScheduler
+
+
+def drain(scheduler, service, count):
+    for _ in range(count):
+        assert scheduler.acquire(service, timeout=0)
+
+
+def test_unlimited_service_is_always_allowed():
+    scheduler = RateLimitScheduler({})
+    assert scheduler.acquire('anything', timeout=0)
+
+
+def test_acquire_takes_tokens_until_the_bucket_is_empty():
+    scheduler = RateLimitScheduler({'svc': {'requests_per_second': 3}})
+    drain(scheduler, 'svc', 3)
+    assert not scheduler.acquire('svc', timeout=0)
+
+
+def test_acquire_waits_for_a_refill_within_the_timeout():
+    scheduler = RateLimitScheduler({'svc': {'requests_per_second': 10}})
+    drain(scheduler, 'svc', 10)
+    start = time.monotonic()
+    assert scheduler.acquire('svc', timeout=1)
+    assert 0.05 <= time.monotonic() - start < 0.5
+
+
+def test_acquire_fails_fast_when_tokens_cannot_arrive_before_the_timeout():
+    scheduler = RateLimitScheduler({'svc': {'units_per_day': 300}})
+    for _ in range(3):
+        assert scheduler.acquire('svc', cost=100, timeout=0)
+
+    # The next 100 units are hours away, so there is no point sleeping to the deadline
+    start = time.monotonic()
+    assert not scheduler.acquire('svc', cost=100, timeout=5)
+    assert time.monotonic() - start < 0.5
+
+
+def test_unit_buckets_charge_the_cost_and_request_buckets_one_token():
+    scheduler = RateLimitScheduler({'svc': {'units_per_day': 1000, 'requests_per_minute': 10}})
+    assert scheduler.acquire('svc', cost=100, timeout=0)
+    remaining = scheduler.remaining()['svc']
+    assert remaining['units_per_day'] == pytest.approx(900, abs=1)
+    assert remaining['requests_per_minute'] == pytest.approx(9, abs=0.1)
+    assert remaining['queued'] == 0
+
+
+def test_cost_above_capacity_is_rejected():
+    scheduler = RateLimitScheduler({'svc': {'units_per_day': 50}})
+    with pytest.raises(ValueError):
+        scheduler.acquire('svc', cost=100)
+
+
+def test_waiting_interactive_calls_go_ahead_of_background_ones():
+    scheduler = RateLimitScheduler({'svc': {'requests_per_second': 5}})
+    drain(scheduler, 'svc', 5)
+    order = []
+
+    def take(priority):
+        scheduler.acquire('svc', priority, timeout=2)
+        order.append(priority)
+
+    background = threading.Thread(target=take, args=(PRIORITY_BACKGROUND,))
+    background.start()
+    time.sleep(0.05)  # The background call is queued first
+    interactive = threading.Thread(target=take, args=(PRIORITY_INTERACTIVE,))
+    interactive.start()
+    background.join()
+    interactive.join()
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
+
+
+def test_a_timed_out_waiter_leaves_the_queue():
+    scheduler = RateLimitScheduler({'svc': {'requests_per_second': 1}})
+    drain(scheduler, 'svc', 1)
+    assert not scheduler.acquire('svc', timeout=0.01)
+    assert scheduler.remaining()['svc']['queued'] == 0
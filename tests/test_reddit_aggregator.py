@@ -0,0 +1,50 @@
+import time
+
+from reddit_aggregator import RedditAggregator
+
+
+class Pages:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, after, priority):
+        self.calls += 1
+        return [(f't3_{self.calls}', "Pikachu is the best", 10, time.time())]
+
+
+def make_aggregator(tmp_path, submitted):
+    fetch_page = Pages()
+    aggregator = RedditAggregator(
+        fetch_page, store_path=str(tmp_path / 'posts.json'), window_days=7,
+        scan_interval=0, rescan_hours=1, max_pages=1,
+        submit=lambda fn, *args: submitted.append((fn, args))
+    )
+    return aggregator, fetch_page
+
+
+def test_first_refresh_scans_in_the_request(tmp_path):
+    submitted = []
+    aggregator, fetch_page = make_aggregator(tmp_path, submitted)
+    aggregator.refresh('interactive')
+    assert fetch_page.calls == 1
+    assert submitted == []
+    assert aggregator.metrics('pikachu')['total_posts'] == 1
+
+
+def test_later_refreshes_scan_in_the_background_once(tmp_path):
+    submitted = []
+    aggregator, fetch_page = make_aggregator(tmp_path, submitted)
+    aggregator.refresh('interactive')
+
+    aggregator.refresh('interactive')
+    aggregator.refresh('interactive')
+    assert fetch_page.calls == 1
+    assert len(submitted) == 1
+
+    fn, args = submitted.pop()
+    fn(*args)
+    assert fetch_page.calls == 2
+    assert aggregator.metrics('pikachu')['total_posts'] == 2
+
+    aggregator.refresh('interactive')
+    assert len(submitted) == 1
@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'score'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(group.do('pikachu', compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(group.do('pikachu', compute)))
+                 for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while group.stats()['coalesced_requests'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [('score', False)] + [('score', True)] * 3
+    assert group.stats() == {'coalesced_requests': 3, 'in_flight': 0}
+
+
+def test_errors_are_raised_and_not_kept():
+    group = SingleFlight()
+
+    def fail():
+        raise RuntimeError('upstream down')
+
+    with pytest.raises(RuntimeError):
+        group.do('pikachu', fail)
+    assert not group.in_flight('pikachu')
+    assert group.do('pikachu', lambda: 'score') == ('score', False)
@@ -0,0 +1,35 @@
+import pytest
+
+from trend_series import TrendSeries, TrendSeriesCodec
+
+
+def test_series_round_trip():
+    codec = TrendSeriesCodec()
+    series = TrendSeries([10.0, 55.5, 100.0], is_fallback=True)
+    decoded = codec.decode(codec.encode(series))
+
+    assert list(decoded.values) == [10.0, 55.5, 100.0]
+    assert decoded.max_value == 100.0
+    assert decoded.avg_value == pytest.approx(55.1666, rel=1e-4)
+    assert decoded.is_fallback
+
+
+def test_empty_series_round_trip():
+    codec = TrendSeriesCodec()
+    decoded = codec.decode(codec.encode(TrendSeries([])))
+    assert list(decoded.values) == []
+    assert not decoded.is_fallback
+
+
+def test_truncated_data_is_rejected():
+    codec = TrendSeriesCodec()
+    data = codec.encode(TrendSeries([1.0, 2.0, 3.0]))
+    with pytest.raises(ValueError):
+        codec.decode(data[:-1])
+
+
+def test_unknown_format_is_rejected():
+    codec = TrendSeriesCodec()
+    data = codec.encode(TrendSeries([1.0]))
+    with pytest.raises(ValueError):
+        codec.decode(b'XXXX' + data[4:])
@@ -0,0 +1,66 @@
+import time
+
+from wikipedia_views import WikipediaPageviews
+
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class MediaWiki:
+    def __init__(self, query):
+        self.query = query
+        self.calls = 0
+
+    def __call__(self, url, priority, **kwargs):
+        self.calls += 1
+        return Response({'query': self.query})
+
+
+def make_pageviews(tmp_path, get, missing_title_ttl=3600):
+    return WikipediaPageviews(
+        get, store_dir=str(tmp_path), window_days=30, timeout=1,
+        wikimedia_url='http://wikimedia', mediawiki_url='http://mediawiki',
+        missing_title_ttl=missing_title_ttl
+    )
+
+
+def test_articles_are_preferred_to_list_redirects(tmp_path):
+    get = MediaWiki({
+        'redirects': [{'from': 'Pikachu (Pokémon)', 'to': 'Pikachu'}],
+        'pages': [{'title': 'Pikachu'}]
+    })
+    assert make_pageviews(tmp_path, get).resolve_titles(['pikachu'], 'interactive') == {'pikachu': 'Pikachu'}
+
+
+def test_list_redirects_count_the_redirect_views(tmp_path):
+    get = MediaWiki({
+        'redirects': [
+            {'from': 'Bulbasaur (Pokémon)', 'to': 'List of generation I Pokémon'},
+            {'from': 'Bulbasaur', 'to': 'List of generation I Pokémon'}
+        ],
+        'pages': [{'title': 'List of generation I Pokémon'}]
+    })
+    pageviews = make_pageviews(tmp_path, get)
+    assert pageviews.resolve_titles(['bulbasaur'], 'interactive') == {'bulbasaur': 'Bulbasaur'}
+    assert pageviews.missing == {}
+
+
+def test_missing_titles_are_retried_after_the_ttl(tmp_path):
+    get = MediaWiki({'pages': [{'title': 'Weedle', 'missing': True}]})
+    pageviews = make_pageviews(tmp_path, get)
+    assert pageviews.resolve_titles(['weedle'], 'interactive') == {'weedle': None}
+    pageviews.resolve_titles(['weedle'], 'interactive')
+    assert get.calls == 1
+
+    # Survives a restart, and is looked up again once expired
+    pageviews = make_pageviews(tmp_path, get)
+    pageviews.resolve_titles(['weedle'], 'interactive')
+    assert get.calls == 1
+    pageviews.missing['weedle'] = time.time() - 3600
+    pageviews.resolve_titles(['weedle'], 'interactive')
+    assert get.calls == 2
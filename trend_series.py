@@ -0,0 +1,79 @@
+"""
+Compact trend series records and their binary cache format
+A series is held as a float32 array rather than a list of Python floats,
+and stored on disk as a fixed header followed by the raw array bytes, so
+reading it back is a copy rather than a parse
+"""
+
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable
+
+# Magic, format version, flags, value count, max value, average value
+HEADER = struct.Struct('<4sBBIff')
+MAGIC = b'PKTS'
+VERSION = 1
+FLAG_FALLBACK = 1
+
+
+class TrendSeries:
+    __slots__ = ('values', 'max_value', 'avg_value', 'is_fallback')
+
+    def __init__(self, values: Iterable[float], is_fallback: bool = False):
+        """Create a series, computing its max and average once"""
+        self.values = values if isinstance(values, array) else array('f', values)
+        self.max_value = max(self.values) if self.values else 0.0
+        self.avg_value = sum(self.values) / len(self.values) if self.values else 0.0
+        self.is_fallback = is_fallback
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TrendSeries':
+        """Create a series from a trends result with a trend_values list"""
+        return cls(data['trend_values'], data.get('is_fallback', False))
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the google_trends metrics without the raw series"""
+        result = {
+            'max_value': float(self.max_value),
+            'avg_value': float(self.avg_value),
+            'points': len(self.values),
+            'success': True
+        }
+        if self.is_fallback:
+            result['is_fallback'] = True
+        return result
+
+
+class TrendSeriesCodec:
+    suffix = '.bin'
+
+    def encode(self, series: TrendSeries) -> bytes:
+        """Serialize a series as a header plus little-endian float32 values"""
+        values = series.values
+        if sys.byteorder == 'big':
+            values = array('f', values)
+            values.byteswap()
+        header = HEADER.pack(MAGIC, VERSION, FLAG_FALLBACK if series.is_fallback else 0,
+                             len(series.values), series.max_value, series.avg_value)
+        return header + values.tobytes()
+
+    def decode(self, data: bytes) -> TrendSeries:
+        """Deserialize a series written by encode"""
+        magic, version, flags, count, max_value, avg_value = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported trend series format {magic!r} v{version}")
+        values = array('f')
+        expected = HEADER.size + count * values.itemsize
+        if len(data) != expected:
+            raise ValueError(f"Trend series is {len(data)} bytes, expected {expected}")
+        values.frombytes(memoryview(data)[HEADER.size:expected])
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        series = TrendSeries.__new__(TrendSeries)
+        series.values = values
+        series.max_value = max_value
+        series.avg_value = avg_value
+        series.is_fallback = bool(flags & FLAG_FALLBACK)
+        return series
@@ -0,0 +1,93 @@
+"""
+Synthetic Google Trends data
+Generated from each Pokemon's popularity tier when real trends data is unavailable
+"""
+
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+# 260 weekly data points (5 years)
+WEEKS = 260
+
+# Seasonal variation (higher in summer and winter), 52 weeks per year
+SEASONAL_CURVE = 10 * np.sin(2 * np.pi * np.arange(WEEKS) / 52)
+
+# Popularity tiers for Gen 1 Pokemon
+HIGH_TIER = frozenset({
+    'pikachu', 'charizard', 'mewtwo', 'mew', 'dragonite',
+    'gyarados', 'gengar', 'snorlax'
+})
+MID_TIER = frozenset({
+    'bulbasaur', 'squirtle', 'eevee', 'arcanine', 'alakazam',
+    'blastoise', 'venusaur', 'lapras', 'raichu', 'machamp'
+})
+LOW_TIER = frozenset({
+    'rattata', 'pidgey', 'weedle', 'caterpie', 'metapod',
+    'kakuna', 'magikarp', 'zubat', 'ekans', 'spearow'
+})
+
+# (lowest base value, highest base value, variance) for each tier
+TIER_PARAMETERS = {
+    'high': (70, 100, 15),
+    'mid': (40, 70, 10),
+    'low': (5, 20, 5),
+    'default': (20, 40, 8)
+}
+
+
+def get_tier(pokemon: str) -> str:
+    """Get the popularity tier for a Pokemon"""
+    name = pokemon.lower()
+    if name in HIGH_TIER:
+        return 'high'
+    if name in MID_TIER:
+        return 'mid'
+    if name in LOW_TIER:
+        return 'low'
+    return 'default'
+
+
+def get_rng(pokemon: str) -> np.random.Generator:
+    """Get a random generator seeded by the Pokemon name, so output is reproducible"""
+    return np.random.default_rng(zlib.crc32(pokemon.lower().encode('utf-8')))
+
+
+def generate_trend_matrix(pokemon_list: List[str]) -> np.ndarray:
+    """Generate one row of weekly trend values per Pokemon"""
+    parameters = np.array([TIER_PARAMETERS[get_tier(p)] for p in pokemon_list], dtype=float)
+    low, high, variance = parameters.T
+
+    # Column 0 picks the base value, the rest drive the weekly variation
+    draws = np.stack([get_rng(p).random(WEEKS + 1) for p in pokemon_list])
+    base_values = low + (high - low) * draws[:, 0]
+    variation = (2 * draws[:, 1:] - 1) * variance[:, None]
+
+    return np.clip(base_values[:, None] + SEASONAL_CURVE + variation, 0, 100)
+
+
+def get_fallback_trends_batch(pokemon_list: List[str]) -> Dict[str, dict]:
+    """Get fallback trends data for several Pokemon in one vectorized pass"""
+    if not pokemon_list:
+        return {}
+
+    matrix = generate_trend_matrix(pokemon_list)
+    max_values = matrix.max(axis=1)
+    avg_values = matrix.mean(axis=1)
+
+    return {
+        pokemon: {
+            'trend_values': matrix[i].tolist(),
+            'max_value': float(max_values[i]),
+            'avg_value': float(avg_values[i]),
+            'success': True,
+            'is_fallback': True
+        }
+        for i, pokemon in enumerate(pokemon_list)
+    }
+
+
+def get_fallback_trends(pokemon: str) -> dict:
+    """Get fallback trends data for a single Pokemon"""
+    return get_fallback_trends_batch([pokemon])[pokemon]
@@ -0,0 +1,415 @@
+"""
+Offline stand-in for the Wikimedia, MediaWiki, Reddit, YouTube and Google Trends APIs
+Serves deterministic data for every Pokemon with configurable latency,
+error rate, YouTube quota and Trends rate limit, and counts calls per endpoint so benchmarks
+can report upstream traffic
+
+Run it and point the collector at it:
+    python upstream_simulator.py --port 8900 --latency 0.05 --error-rate 0.01
+    UPSTREAM_BASE_URL=http://127.0.0.1:8900 python app.py
+
+GET /__stats returns call counts and quota use; POST /__reset clears them.
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from pokemon_data import VALID_POKEMON
+
+logger = logging.getLogger(__name__)
+
+PAGEVIEWS_PREFIX = '/api/rest_v1/metrics/pageviews/per-article/'
+
+# YouTube Data API quota cost of each method
+YOUTUBE_QUOTA_COSTS = {
+    'search': 100,
+    'videos': 1
+}
+
+DAY_FORMAT = '%Y%m%d'
+
+# Seconds between simulated posts in the Reddit /new listing
+REDDIT_POST_INTERVAL = 600
+
+# Google Trends serves 5 years of weekly points, behind an anti-JSON-hijacking prefix
+TRENDS_WEEKS = 260
+TRENDS_EXPLORE_PREFIX = ")]}'"
+TRENDS_WIDGET_PREFIX = ")]}',"
+
+POKEMON_NAMES = sorted(VALID_POKEMON)
+
+
+def seed_for(name: str) -> int:
+    """Get a stable per-name seed so every run serves the same data"""
+    return zlib.crc32(name.lower().encode('utf-8'))
+
+
+class UpstreamSimulator(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.05, jitter: float = 0.5,
+                 error_rate: float = 0.0, youtube_quota: int = 10000, trends_limit: int = 0):
+        """Create a simulator; latency is the mean delay in seconds, jitter its relative spread
+
+        trends_limit is the number of Trends payloads allowed per minute
+        before 429s (0 for no limit).
+        """
+        super().__init__(address, SimulatorHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.youtube_quota = youtube_quota
+        self.trends_limit = trends_limit
+        self.lock = threading.Lock()
+        self.reset()
+
+    @property
+    def base_url(self) -> str:
+        """Get the URL to use as UPSTREAM_BASE_URL"""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def reset(self):
+        """Clear call counters and the used YouTube quota"""
+        with self.lock:
+            self.calls: Dict[str, int] = {}
+            self.errors: Dict[str, int] = {}
+            self.quota_used = 0
+            self.trends_payloads: List[float] = []  # Times of recent Trends payloads
+
+    def stats(self) -> dict:
+        """Get call counts per endpoint and quota use"""
+        with self.lock:
+            return {
+                'calls': dict(self.calls),
+                'errors': dict(self.errors),
+                'total_calls': sum(self.calls.values()),
+                'youtube_quota_used': self.quota_used,
+                'youtube_quota': self.youtube_quota
+            }
+
+    def start(self) -> threading.Thread:
+        """Serve on a daemon thread"""
+        thread = threading.Thread(target=self.serve_forever, name='upstream-simulator', daemon=True)
+        thread.start()
+        return thread
+
+    def record(self, endpoint: str, failed: bool = False):
+        """Count one call to an endpoint"""
+        with self.lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            if failed:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def charge_quota(self, method: str) -> bool:
+        """Charge a YouTube call against the daily quota; False once it is spent"""
+        cost = YOUTUBE_QUOTA_COSTS[method]
+        with self.lock:
+            if self.quota_used + cost > self.youtube_quota:
+                return False
+            self.quota_used += cost
+            return True
+
+    def allow_trends_payload(self) -> bool:
+        """Count a Trends payload against the per-minute limit; False once it is reached"""
+        now = time.monotonic()
+        with self.lock:
+            self.trends_payloads = [t for t in self.trends_payloads if now - t < 60]
+            if self.trends_limit and len(self.trends_payloads) >= self.trends_limit:
+                return False
+            self.trends_payloads.append(now)
+            return True
+
+    def delay(self):
+        """Sleep for one simulated round trip"""
+        if self.latency > 0:
+            spread = self.latency * self.jitter
+            time.sleep(max(0.0, random.uniform(self.latency - spread, self.latency + spread)))
+
+    def should_fail(self) -> bool:
+        """Decide whether to inject a server error"""
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def send_json(self, status: int, body: dict, prefix: str = ''):
+        """Send a complete JSON response, after prefix if given"""
+        payload = (prefix + json.dumps(body)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        # Drain the body so the connection can be reused
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        if url.path == '/__reset':
+            self.server.reset()
+            self.send_json(200, {'reset': True})
+        elif url.path == '/api/v1/access_token':
+            self.respond('reddit_token', lambda: (200, {
+                'access_token': 'simulated-token',
+                'token_type': 'bearer',
+                'expires_in': 86400,
+                'scope': '*'
+            }))
+        elif url.path == '/trends/api/explore':
+            self.respond('trends_explore', lambda: self.trends_explore(parse_qs(url.query)),
+                         prefix=TRENDS_EXPLORE_PREFIX)
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == '/__stats':
+            self.send_json(200, self.server.stats())
+        elif url.path.startswith(PAGEVIEWS_PREFIX):
+            self.respond('wikimedia_pageviews', lambda: self.pageviews(url.path))
+        elif url.path == '/w/api.php':
+            self.respond('mediawiki_query', lambda: self.mediawiki_query(query))
+        elif url.path.startswith('/r/') and url.path.rstrip('/').endswith('/search'):
+            self.respond('reddit_search', lambda: self.reddit_search(query))
+        elif url.path.startswith('/r/') and url.path.rstrip('/').endswith('/new'):
+            self.respond('reddit_new', lambda: self.reddit_new(query))
+        elif url.path.rstrip('/') == '/youtube/v3/search':
+            self.respond('youtube_search', lambda: self.youtube_search(query))
+        elif url.path.rstrip('/') == '/youtube/v3/videos':
+            self.respond('youtube_videos', lambda: self.youtube_videos(query))
+        elif url.path.rstrip('/') == '/trends/explore':
+            self.respond('trends_cookie', lambda: (200, {}))
+        elif url.path == '/trends/api/widgetdata/multiline':
+            self.respond('trends_multiline', lambda: self.trends_multiline(query), prefix=TRENDS_WIDGET_PREFIX)
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+    def respond(self, endpoint: str, handler, prefix: str = ''):
+        """Apply latency and injected errors, then send the handler's (status, body)"""
+        self.server.delay()
+        if self.server.should_fail():
+            self.server.record(endpoint, failed=True)
+            self.send_json(503, {'error': 'Simulated upstream failure'})
+            return
+        status, body = handler()
+        self.server.record(endpoint, failed=status >= 400)
+        self.send_json(status, body, prefix if status == 200 else '')
+
+    def pageviews(self, path: str) -> Tuple[int, dict]:
+        """Daily views for an article between two YYYYMMDD00 timestamps"""
+        parts = path[len(PAGEVIEWS_PREFIX):].split('/')
+        if len(parts) != 7 or parts[4] != 'daily':
+            return 400, {'title': 'Bad request'}
+        title = unquote(parts[3])
+        start = datetime.strptime(parts[5][:8], DAY_FORMAT)
+        end = datetime.strptime(parts[6][:8], DAY_FORMAT)
+
+        base_views = 200 + seed_for(title) % 20000
+        items = []
+        day = start
+        while day <= end:
+            rng = random.Random(seed_for(title) ^ int(day.strftime(DAY_FORMAT)))
+            items.append({
+                'article': title,
+                'granularity': 'daily',
+                'timestamp': day.strftime(DAY_FORMAT) + '00',
+                'views': int(base_views * rng.uniform(0.6, 1.4))
+            })
+            day += timedelta(days=1)
+        return 200, {'items': items}
+
+    def mediawiki_query(self, query: dict) -> Tuple[int, dict]:
+        """Every requested title exists as a plain article"""
+        titles = query.get('titles', [''])[0].split('|')
+        return 200, {
+            'batchcomplete': True,
+            'query': {'pages': [{'pageid': seed_for(t), 'ns': 0, 'title': t} for t in titles if t]}
+        }
+
+    def reddit_search(self, query: dict) -> Tuple[int, dict]:
+        """A listing of posts whose titles mention the searched name"""
+        term = query.get('q', [''])[0].replace('title:', '')
+        limit = min(int(query.get('limit', ['25'])[0]), 100)
+        rng = random.Random(seed_for(term))
+        count = rng.randint(0, limit)
+        now = time.time()
+        children = [
+            {
+                'kind': 't3',
+                'data': {
+                    'id': f'{seed_for(term) % 100000:x}{i}',
+                    'name': f't3_{seed_for(term) % 100000:x}{i}',
+                    'title': f'{term.title()} post {i}',
+                    'score': rng.randint(0, 5000),
+                    'num_comments': rng.randint(0, 500),
+                    'created_utc': now - rng.randint(0, 365 * 86400)
+                }
+            }
+            for i in range(count)
+        ]
+        return 200, {'kind': 'Listing', 'data': {'after': None, 'before': None, 'children': children}}
+
+    def reddit_new(self, query: dict) -> Tuple[int, dict]:
+        """A page of the newest posts, one every REDDIT_POST_INTERVAL seconds, paged by 'after'"""
+        limit = min(int(query.get('limit', ['25'])[0]), 100)
+        after = query.get('after', [''])[0]
+        newest = int(after[3:]) - 1 if after.startswith('t3_') else int(time.time()) // REDDIT_POST_INTERVAL
+        children = []
+        for index in range(newest, max(newest - limit, 0), -1):
+            rng = random.Random(index)
+            name = rng.choice(POKEMON_NAMES)
+            children.append({
+                'kind': 't3',
+                'data': {
+                    'id': str(index),
+                    'name': f't3_{index}',
+                    'title': f'Look at my {name} {rng.choice(("fan art", "catch", "card", "team"))}',
+                    'score': rng.randint(0, 5000),
+                    'num_comments': rng.randint(0, 500),
+                    'created_utc': index * REDDIT_POST_INTERVAL
+                }
+            })
+        return 200, {'kind': 'Listing', 'data': {
+            'after': children[-1]['data']['name'] if children else None,
+            'before': None,
+            'children': children
+        }}
+
+    def quota_exceeded(self) -> Tuple[int, dict]:
+        """The error the Data API returns once the daily quota is spent"""
+        return 403, {'error': {
+            'code': 403,
+            'message': 'The request cannot be completed because you have exceeded your quota.',
+            'errors': [{'domain': 'youtube.quota', 'reason': 'quotaExceeded'}]
+        }}
+
+    def youtube_search(self, query: dict) -> Tuple[int, dict]:
+        """Up to maxResults video ids for a search term"""
+        if not self.server.charge_quota('search'):
+            return self.quota_exceeded()
+        term = query.get('q', [''])[0]
+        count = min(int(query.get('maxResults', ['5'])[0]), 50)
+        items = [
+            {'kind': 'youtube#searchResult', 'id': {'kind': 'youtube#video', 'videoId': f'{seed_for(term):08x}{i:03d}'}}
+            for i in range(count)
+        ]
+        return 200, {'kind': 'youtube#searchListResponse', 'items': items}
+
+    def youtube_videos(self, query: dict) -> Tuple[int, dict]:
+        """Statistics for up to 50 comma-separated video ids"""
+        if not self.server.charge_quota('videos'):
+            return self.quota_exceeded()
+        ids = [i for i in query.get('id', [''])[0].split(',') if i][:50]
+        items = []
+        for video_id in ids:
+            rng = random.Random(seed_for(video_id))
+            views = rng.randint(1000, 5000000)
+            items.append({
+                'kind': 'youtube#video',
+                'id': video_id,
+                'statistics': {'viewCount': str(views), 'likeCount': str(views // rng.randint(20, 100))}
+            })
+        return 200, {'kind': 'youtube#videoListResponse', 'items': items}
+
+
+    def trends_explore(self, query: dict) -> Tuple[int, dict]:
+        """The widgets for a comparison payload; the TIMESERIES token carries the request"""
+        if not self.server.allow_trends_payload():
+            return 429, {'error': 'Too many requests'}
+        request = json.loads(query.get('req', ['{}'])[0])
+        return 200, {'widgets': [{
+            'id': 'TIMESERIES',
+            'request': {'comparisonItem': request.get('comparisonItem', [])},
+            'token': 'simulated-token'
+        }]}
+
+    def trends_multiline(self, query: dict) -> Tuple[int, dict]:
+        """Weekly interest for up to 5 keywords, scaled so the payload's peak is 100"""
+        request = json.loads(query.get('req', ['{}'])[0])
+        keywords = [item['keyword'] for item in request.get('comparisonItem', [])]
+        if not keywords or len(keywords) > 5:
+            return 400, {'error': 'Between 1 and 5 keywords are allowed'}
+
+        week = 7 * 86400
+        first_week = int(time.time()) // week - TRENDS_WEEKS + 1
+        interest = {}
+        for keyword in keywords:
+            # Popularity spans two orders of magnitude, with a yearly cycle and weekly noise
+            base = 10 ** (seed_for(keyword) % 1000 / 500)
+            interest[keyword] = [
+                base * (1 + 0.3 * math.sin(2 * math.pi * (first_week + i) / 52))
+                * random.Random(seed_for(keyword) ^ (first_week + i)).uniform(0.8, 1.2)
+                for i in range(TRENDS_WEEKS)
+            ]
+        peak = max(max(values) for values in interest.values())
+        timeline = [
+            {
+                'time': str((first_week + i) * week),
+                'value': [round(100 * interest[keyword][i] / peak) for keyword in keywords],
+                **({'isPartial': True} if i == TRENDS_WEEKS - 1 else {})
+            }
+            for i in range(TRENDS_WEEKS)
+        ]
+        return 200, {'default': {'timelineData': timeline}}
+
+
+def start_simulator(host: str = '127.0.0.1', port: int = 0, **settings) -> UpstreamSimulator:
+    """Start a simulator on a background thread; port 0 picks a free port"""
+    simulator = UpstreamSimulator((host, port), **settings)
+    simulator.start()
+    logger.info(f"Upstream simulator listening on {simulator.base_url}")
+    return simulator
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.5, help='Delay spread as a share of the mean')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of calls answered with 503')
+    parser.add_argument('--youtube-quota', type=int, default=10000, help='YouTube quota units available')
+    parser.add_argument('--trends-limit', type=int, default=0, help='Trends payloads per minute before 429s')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = UpstreamSimulator(
+        (args.host, args.port),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        youtube_quota=args.youtube_quota,
+        trends_limit=args.trends_limit
+    )
+    logger.info(f"Upstream simulator listening on {simulator.base_url}")
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Incremental Wikipedia pageview collection
+Daily view counts are stored per article and only days newer than the last
+stored point are requested, so steady-state traffic is one small delta
+request per article per day
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+# Per-article pageviews path under the Wikimedia REST API base URL
+PAGEVIEWS_PATH = '/metrics/pageviews/per-article/en.wikipedia/all-access/all-agents'
+
+# MediaWiki accepts up to 50 titles per query
+TITLES_PER_QUERY = 50
+
+# Average days per month, for the monthly average
+DAYS_PER_MONTH = 365.25 / 12
+
+DAY_FORMAT = '%Y%m%d'
+
+# Daily counts are published with a delay; newer days are not requested
+PUBLICATION_LAG_DAYS = 2
+
+
+def map_serially(fn: Callable[[Any], Any], items: list) -> list:
+    """Apply fn to each item in turn"""
+    return [fn(item) for item in items]
+
+
+def display_name(pokemon: str) -> str:
+    """Get the capitalized spelling Wikipedia uses, e.g. 'mr. mime' -> 'Mr. Mime'"""
+    return ' '.join(word[:1].upper() + word[1:] for word in pokemon.split(' '))
+
+
+def candidate_titles(pokemon: str) -> List[str]:
+    """Get article titles to try for a Pokemon, most specific first"""
+    name = display_name(pokemon)
+    return [f'{name} (Pokémon)', name]
+
+
+class WikipediaPageviews:
+    def __init__(self, get: Callable[..., Any], store_dir: str, window_days: int, timeout: float,
+                 wikimedia_url: str, mediawiki_url: str, map_calls: Callable[..., list] = map_serially,
+                 missing_title_ttl: float = 86400):
+        """Create a pageview store backed by JSON files in store_dir"""
+        self.get = get  # get(url, priority, **kwargs); rate limits and raises for HTTP errors
+        self.map_calls = map_calls  # map_calls(fn, items); lets articles refresh concurrently
+        self.pageviews_url = f'{wikimedia_url}{PAGEVIEWS_PATH}'
+        self.mediawiki_url = mediawiki_url
+        self.store_dir = store_dir
+        self.window_days = window_days
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.series: Dict[str, Dict[str, int]] = {}
+
+        if not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+        self.titles_file = os.path.join(store_dir, 'titles.json')
+        self.titles: Dict[str, Optional[str]] = self.read_json(self.titles_file) or {}
+        # When each Pokemon without an article was last looked up; older ones are retried
+        self.missing_title_ttl = missing_title_ttl
+        self.missing_file = os.path.join(store_dir, 'missing_titles.json')
+        self.missing: Dict[str, float] = self.read_json(self.missing_file) or {}
+
+    def read_json(self, path: str):
+        """Read a JSON file, or None if it is missing or unreadable"""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading {path}: {str(e)}")
+            return None
+
+    def write_json(self, path: str, data):
+        """Write a JSON file atomically"""
+        # Unique per writer, so concurrent saves never share a half-written file
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.error(f"Error writing {path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def resolve_titles(self, pokemon_list: List[str], priority: str) -> Dict[str, Optional[str]]:
+        """Get each Pokemon's article title, resolving unknown ones in batched queries"""
+        now = time.time()
+        unresolved = [
+            p for p in pokemon_list
+            if p not in self.titles
+            or (self.titles[p] is None and now - self.missing.get(p, 0) >= self.missing_title_ttl)
+        ]
+        for start in range(0, len(unresolved), TITLES_PER_QUERY // 2):
+            # Two candidate titles per Pokemon
+            self.query_titles(unresolved[start:start + TITLES_PER_QUERY // 2], priority)
+        return {p: self.titles.get(p) for p in pokemon_list}
+
+    def query_titles(self, pokemon_list: List[str], priority: str):
+        """Ask MediaWiki which candidate titles are real, non-disambiguation articles"""
+        candidates = {p: candidate_titles(p) for p in pokemon_list}
+        response = self.get(self.mediawiki_url, priority, params={
+            'action': 'query',
+            'titles': '|'.join(t for titles in candidates.values() for t in titles),
+            'redirects': 1,
+            'prop': 'pageprops',
+            'ppprop': 'disambiguation',
+            'format': 'json',
+            'formatversion': 2
+        }, timeout=self.timeout)
+        query = response.json().get('query', {})
+
+        # Follow title normalization and redirects to the final article
+        renames = {item['from']: item['to'] for item in query.get('normalized', [])}
+        redirects = {item['from']: item['to'] for item in query.get('redirects', [])}
+        articles = {
+            page['title'] for page in query.get('pages', [])
+            if not page.get('missing') and 'disambiguation' not in page.get('pageprops', {})
+        }
+
+        def resolve(titles: List[str]) -> Optional[str]:
+            titles = [renames.get(title, title) for title in titles]
+            for title in titles:
+                target = redirects.get(title, title)
+                # Redirects into list articles would count views for many Pokemon
+                if target in articles and not target.startswith('List of'):
+                    return target
+            # Most Gen 1 Pokemon only redirect into a list article; the redirect's
+            # own page views are theirs alone, most of them through the plain name
+            for title in reversed(titles):
+                if redirects.get(title, '').startswith('List of'):
+                    return title
+            return None
+
+        now = time.time()
+        with self.lock:
+            for pokemon, titles in candidates.items():
+                self.titles[pokemon] = resolve(titles)
+                if self.titles[pokemon] is None:
+                    self.missing[pokemon] = now
+                else:
+                    self.missing.pop(pokemon, None)
+                logger.debug(f"Resolved Wikipedia article for {pokemon}: {self.titles[pokemon]}")
+            self.write_json(self.titles_file, self.titles)
+            self.write_json(self.missing_file, self.missing)
+
+    def series_file(self, title: str) -> str:
+        """Get the on-disk path for an article's daily series"""
+        return os.path.join(self.store_dir, f"series_{quote(title, safe='')}.json")
+
+    def load_series(self, title: str) -> Dict[str, int]:
+        """Get an article's stored daily series"""
+        with self.lock:
+            series = self.series.get(title)
+            if series is None:
+                series = self.read_json(self.series_file(title)) or {}
+                self.series[title] = series
+            return series
+
+    def refresh_series(self, title: str, priority: str) -> Dict[str, int]:
+        """Fetch only the days newer than the last stored point"""
+        series = self.load_series(title)
+        latest = datetime.now().date() - timedelta(days=PUBLICATION_LAG_DAYS)
+        window_start = latest - timedelta(days=self.window_days - 1)
+
+        last_day = max(series) if series else None
+        if last_day and datetime.strptime(last_day, DAY_FORMAT).date() >= latest:
+            return series  # Already up to date; no request needed
+
+        start = window_start
+        if last_day:
+            start = max(start, datetime.strptime(last_day, DAY_FORMAT).date() + timedelta(days=1))
+
+        url = (f"{self.pageviews_url}/{quote(title.replace(' ', '_'), safe='')}/daily/"
+               f"{start.strftime(DAY_FORMAT)}00/{latest.strftime(DAY_FORMAT)}00")
+        response = self.get(url, priority, timeout=self.timeout)
+
+        updated = dict(series)
+        for item in response.json().get('items', []):
+            updated[item['timestamp'][:8]] = item['views']
+        # Days with no views are omitted by the API; record the end of the
+        # fetched range so they are not requested again
+        updated.setdefault(latest.strftime(DAY_FORMAT), 0)
+
+        cutoff = window_start.strftime(DAY_FORMAT)
+        updated = {day: views for day, views in updated.items() if day >= cutoff}
+        with self.lock:
+            self.series[title] = updated
+            self.write_json(self.series_file(title), updated)
+        return updated
+
+    def summarize(self, title: str, series: Dict[str, int]) -> dict:
+        """Convert a daily series into the collector's Wikipedia metrics"""
+        total_views = sum(series.values())
+        days = 1
+        if series:
+            first, last = (datetime.strptime(day, DAY_FORMAT) for day in (min(series), max(series)))
+            days = (last - first).days + 1
+        return {
+            'total_views': int(total_views),
+            'monthly_avg': float(total_views * DAYS_PER_MONTH / days),
+            'article': title,
+            'success': True
+        }
+
+    def get_views(self, pokemon_list: List[str], priority: str) -> Dict[str, dict]:
+        """Get Wikipedia metrics for several Pokemon, refreshing each article incrementally"""
+        failure = {'total_views': 0, 'monthly_avg': 0.0, 'success': False}
+        try:
+            titles = self.resolve_titles(pokemon_list, priority)
+        except Exception as e:
+            logger.error(f"Wikipedia API error: {str(e)}")
+            return {p: dict(failure, error=str(e)) for p in pokemon_list}
+
+        def views(title: Optional[str]) -> dict:
+            if title is None:
+                return dict(failure, error='No Wikipedia article found')
+            try:
+                series = self.refresh_series(title, priority)
+            except Exception as e:
+                logger.error(f"Wikipedia API error: {str(e)}")
+                # Fall back to whatever was stored before the failed refresh
+                series = self.load_series(title)
+                if not series:
+                    return dict(failure, error=str(e))
+            return self.summarize(title, series)
+
+        pokemon_names = list(titles)
+        return dict(zip(pokemon_names, self.map_calls(views, [titles[p] for p in pokemon_names])))